@@ -0,0 +1 @@
+"""Benchmarks de abertura, renderização, zoom e miniaturas"""
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+Gera arquivos .xd sintéticos de tamanho controlado para os benchmarks
+
+Uso (na pasta do projeto):
+    python3 -m benchmarks.generate_corpus saida.xd --artboards 20 --elements 2000 --text-ratio 0.3 \\
+        --bitmaps 10 --bitmap-size 1024
+"""
+import argparse
+import io
+import json
+import random
+import sys
+import zipfile
+from typing import Any, Dict, List, Optional
+
+from PIL import Image
+
+
+class CorpusSpec:
+    """Parâmetros de um documento sintético"""
+    
+    def __init__(self, artboards: int = 10, elements: int = 500, text_ratio: float = 0.2,
+                 bitmaps: int = 5, bitmap_size: int = 512, image_ratio: float = 0.02,
+                 group_ratio: float = 0.05, width: int = 1920, height: int = 1080, seed: int = 0):
+        self.artboards = artboards
+        self.elements = elements
+        self.text_ratio = text_ratio
+        self.bitmaps = bitmaps
+        self.bitmap_size = bitmap_size
+        self.image_ratio = image_ratio if bitmaps else 0.0
+        self.group_ratio = group_ratio
+        self.width = width
+        self.height = height
+        self.seed = seed
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return dict(vars(self))
+
+
+def make_bitmap(rng: random.Random, size: int) -> bytes:
+    """PNG com gradiente e ruído (comprime como uma foto, não como uma cor sólida)"""
+    base = Image.linear_gradient('L').resize((size, size)).rotate(rng.uniform(0, 360))
+    noise = Image.effect_noise((size, size), rng.uniform(20, 60))
+    tint = Image.new('RGB', (size, size), tuple(rng.randrange(256) for _ in range(3)))
+    image = Image.merge('RGB', (base, noise, Image.blend(base, noise, 0.5)))
+    image = Image.blend(image, tint, 0.3)
+    buffer = io.BytesIO()
+    image.save(buffer, 'PNG')
+    return buffer.getvalue()
+
+
+def make_element(rng: random.Random, spec: CorpusSpec, bitmap_paths: List[str], depth: int = 0) -> Dict[str, Any]:
+    """Elemento aleatório no formato lido pelo ArtboardRenderer"""
+    roll = rng.random()
+    x, y = rng.uniform(0, spec.width), rng.uniform(0, spec.height)
+    width, height = rng.uniform(8, 240), rng.uniform(8, 160)
+    color = '#%06x' % rng.randrange(1 << 24)
+    
+    if roll < spec.text_ratio:
+        words = rng.randint(1, 12)
+        text = ' '.join(rng.choice(['Lorem', 'ipsum', 'dolor', 'sit', 'amet', 'título', 'ação', 'XD'])
+                        for _ in range(words))
+        return {'type': 'text', 'x': x, 'y': y, 'text': text, 'fontSize': rng.choice([10, 12, 14, 18, 24, 32]),
+                'fill': color}
+    roll -= spec.text_ratio
+    if roll < spec.image_ratio:
+        return {'type': 'image', 'x': x, 'y': y, 'width': width * 2, 'height': height * 2,
+                'href': rng.choice(bitmap_paths), 'opacity': rng.choice([1.0, 1.0, 0.8])}
+    roll -= spec.image_ratio
+    if roll < spec.group_ratio and depth < 2:
+        children = [make_element(rng, spec, bitmap_paths, depth + 1) for _ in range(rng.randint(2, 8))]
+        for child in children:
+            # Filhos em coordenadas relativas ao grupo
+            child['x'] = rng.uniform(0, 300)
+            child['y'] = rng.uniform(0, 200)
+        return {'type': 'group', 'x': x, 'y': y, 'children': children}
+    
+    kind = rng.choice(['rectangle', 'rectangle', 'ellipse', 'line'])
+    element = {'type': kind, 'x': x, 'y': y, 'width': width, 'height': height, 'fill': color}
+    if rng.random() < 0.3:
+        element['stroke'] = '#%06x' % rng.randrange(1 << 24)
+        element['strokeWidth'] = rng.choice([1, 2, 4])
+    if kind == 'line':
+        element['stroke'] = color
+        element['strokeWidth'] = rng.choice([1, 2, 3])
+        if rng.random() < 0.5:
+            element['path'] = [{'x': rng.uniform(0, 200), 'y': rng.uniform(0, 200)} for _ in range(rng.randint(2, 6))]
+    if rng.random() < 0.2:
+        element['opacity'] = rng.choice([0.3, 0.5, 0.8])
+    return element
+
+
+def generate_xd(path: str, spec: Optional[CorpusSpec] = None) -> Dict[str, Any]:
+    """Grava o documento sintético em path e retorna um resumo (membros e bytes)"""
+    spec = spec or CorpusSpec()
+    rng = random.Random(spec.seed)
+    bitmap_paths = [f'resources/bitmap-{i}.png' for i in range(spec.bitmaps)]
+    
+    with zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr('mimetype', 'application/vnd.adobe.sparkler.project+dcxucf', zipfile.ZIP_STORED)
+        archive.writestr('manifest.json', json.dumps({'name': 'synthetic', 'spec': spec.to_dict()}))
+        for bitmap_path in bitmap_paths:
+            # PNG já é comprimido
+            archive.writestr(bitmap_path, make_bitmap(rng, spec.bitmap_size), zipfile.ZIP_STORED)
+        for index in range(spec.artboards):
+            artboard = {
+                'type': 'artboard',
+                'name': f'Artboard {index + 1}',
+                'width': spec.width,
+                'height': spec.height,
+                'backgroundColor': '#FFFFFF',
+                'children': [make_element(rng, spec, bitmap_paths) for _ in range(spec.elements)]
+            }
+            archive.writestr(f'artwork/artboard-{index}.json', json.dumps(artboard))
+    
+    with zipfile.ZipFile(path) as archive:
+        members = archive.infolist()
+    return {
+        'path': path,
+        'members': len(members),
+        'compressed_bytes': sum(info.compress_size for info in members),
+        'uncompressed_bytes': sum(info.file_size for info in members),
+        'spec': spec.to_dict()
+    }
+
+
+def add_spec_arguments(parser: argparse.ArgumentParser):
+    """Opções de tamanho do documento (compartilhadas com run_benchmarks)"""
+    defaults = CorpusSpec()
+    parser.add_argument('--artboards', type=int, default=defaults.artboards, help="quantidade de artboards")
+    parser.add_argument('--elements', type=int, default=defaults.elements, help="elementos por artboard")
+    parser.add_argument('--text-ratio', type=float, default=defaults.text_ratio, help="fração de elementos de texto")
+    parser.add_argument('--bitmaps', type=int, default=defaults.bitmaps, help="bitmaps embutidos")
+    parser.add_argument('--bitmap-size', type=int, default=defaults.bitmap_size, help="lado dos bitmaps, em pixels")
+    parser.add_argument('--image-ratio', type=float, default=defaults.image_ratio,
+                        help="fração de elementos que referenciam bitmaps")
+    parser.add_argument('--group-ratio', type=float, default=defaults.group_ratio, help="fração de elementos que são grupos")
+    parser.add_argument('--size', type=int, nargs=2, default=(defaults.width, defaults.height),
+                        metavar=('LARGURA', 'ALTURA'), help="dimensões dos artboards")
+    parser.add_argument('--seed', type=int, default=defaults.seed, help="semente do gerador aleatório")
+
+
+def spec_from_args(args: argparse.Namespace) -> CorpusSpec:
+    return CorpusSpec(artboards=args.artboards, elements=args.elements, text_ratio=args.text_ratio,
+                      bitmaps=args.bitmaps, bitmap_size=args.bitmap_size, image_ratio=args.image_ratio,
+                      group_ratio=args.group_ratio, width=args.size[0], height=args.size[1], seed=args.seed)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Gera um arquivo .xd sintético")
+    parser.add_argument('output', help="arquivo .xd a gerar")
+    add_spec_arguments(parser)
+    args = parser.parse_args(argv)
+    summary = generate_xd(args.output, spec_from_args(args))
+    print(json.dumps(summary, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+"""
+Mede cada etapa da abertura e exibição de um .xd e grava os tempos em JSON
+
+Uso (na pasta do projeto):
+    python3 -m benchmarks.run_benchmarks -o resultado.json --artboards 10 --elements 2000
+    python3 -m benchmarks.run_benchmarks -o resultado.json --xd documento_real.xd
+
+Sem --xd, um documento sintético é gerado com as opções de tamanho dadas
+(ver generate_corpus). Cada medida é repetida --repeat vezes; o JSON traz
+todas as amostras e mínimo/mediana/média, para comparar execuções.
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional
+
+import PIL
+from PIL import Image
+
+from extraction import XDStructureAnalyzer, ArtboardExtractor, XDContentExtractor, XDArchive, ProjectIndex
+from display import DisplayState, ImageDisplayController, ArtboardRenderer, FontCache, TextRunCache
+from ui.thumbnails import make_thumbnail, render_artboard_thumbnail
+from .generate_corpus import add_spec_arguments, generate_xd, spec_from_args
+
+ARTBOARD_TYPES = ('artboard_json', 'artboard_manifest')
+ZOOM_SCALES = (0.25, 0.5, 1.5, 3.0)
+VIEWPORT = (1280, 800)
+THUMBNAIL_SIZE = (150, 150)
+
+
+def measure(function: Callable[[], Any], repeat: int) -> Dict[str, Any]:
+    """Executa function repeat vezes e resume os tempos (segundos)"""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        samples.append(time.perf_counter() - start)
+    return summarize(samples)
+
+
+def summarize(samples: List[float]) -> Dict[str, Any]:
+    return {
+        'samples': samples,
+        'min': min(samples),
+        'median': statistics.median(samples),
+        'mean': statistics.fmean(samples),
+        'total': sum(samples)
+    }
+
+
+def bench_extract(xd_path: str, repeat: int) -> Dict[str, Any]:
+    """Abertura do arquivo, análise da estrutura, extração de artboards e extract_content completo (caches frios)"""
+    def open_archive():
+        XDArchive(xd_path).close()
+    
+    def parse_structure():
+        archive = XDArchive(xd_path)
+        try:
+            XDStructureAnalyzer().parse_structure(archive)
+        finally:
+            archive.close()
+    
+    def extract_artboards():
+        archive = XDArchive(xd_path)
+        try:
+            ArtboardExtractor(XDStructureAnalyzer()).extract_artboards(archive)
+        finally:
+            archive.close()
+    
+    def extract_content():
+        extractor = XDContentExtractor(ArtboardExtractor(XDStructureAnalyzer()))
+        extractor.extract_content(xd_path)
+        extractor.cleanup()
+    
+    return {
+        'unzip': measure(open_archive, repeat),
+        'parse_structure': measure(parse_structure, repeat),
+        'extract_artboards': measure(extract_artboards, repeat),
+        'extract_content': measure(extract_content, repeat)
+    }
+
+
+def bench_render(archive: XDArchive, artboards: List[Dict[str, Any]], repeat: int) -> Dict[str, Any]:
+    """render_artboard por artboard: primeira vez (renderizador novo) e repetições (caches quentes)"""
+    cold, warm = [], []
+    for item in artboards:
+        # Fontes e textos próprios: os caches compartilhados do processo já estariam quentes
+        renderer = ArtboardRenderer(archive.root, archive, fonts=FontCache(), text_runs=TextRunCache())
+        start = time.perf_counter()
+        renderer.render_artboard(item['data'])
+        cold.append(time.perf_counter() - start)
+        for _ in range(repeat):
+            start = time.perf_counter()
+            renderer.render_artboard(item['data'])
+            warm.append(time.perf_counter() - start)
+    return {'cold': summarize(cold), 'warm': summarize(warm), 'artboards': len(artboards)}
+
+
+def bench_zoom(archive: XDArchive, artboard: Dict[str, Any], repeat: int) -> Dict[str, Any]:
+    """Reamostragem de uma área do tamanho do viewport em várias escalas (bitmap e re-rasterização vetorial)"""
+    controller = ImageDisplayController(DisplayState())
+    controller.resources = archive
+    controller.load_content(artboard, archive.root)
+    width, height = controller.original_image.size
+    results = {}
+    for scale in ZOOM_SCALES:
+        scaled_size = (max(1, int(width * scale)), max(1, int(height * scale)))
+        box = (0, 0, min(VIEWPORT[0], scaled_size[0]), min(VIEWPORT[1], scaled_size[1]))
+        modes = {'bitmap': False, 'vector': True} if scale > 1.0 else {'bitmap': False}
+        for mode, rasterize in modes.items():
+            def resample():
+                # Cada amostra parte fria: sem blocos vetoriais nem níveis da pirâmide de escalas anteriores
+                controller.reset_caches()
+                controller.resample_region(scaled_size, box, Image.Resampling.LANCZOS, rasterize=rasterize)
+            results[f'{mode}@{scale}'] = measure(resample, repeat)
+    controller.close()
+    return results
+
+
+def bench_thumbnails(archive: XDArchive, artboards: List[Dict[str, Any]], bitmaps: List[str],
+                     repeat: int) -> Dict[str, Any]:
+    """Miniaturas de artboards (renderizados na escala da miniatura) e de bitmaps embutidos"""
+    results = {}
+    if artboards:
+        def artboard_thumbnails():
+            # Cada amostra parte fria: fontes e textos novos em vez dos caches compartilhados do processo
+            fonts, text_runs = FontCache(), TextRunCache()
+            for item in artboards:
+                renderer = ArtboardRenderer(archive.root, archive, fonts=fonts, text_runs=text_runs)
+                render_artboard_thumbnail(item['data'], archive.root, archive, THUMBNAIL_SIZE, renderer=renderer)
+        results['artboards'] = measure(artboard_thumbnails, repeat)
+        results['artboards']['items'] = len(artboards)
+    if bitmaps:
+        def bitmap_thumbnails():
+            for path in bitmaps:
+                with archive.open(path) as f:
+                    make_thumbnail(f, THUMBNAIL_SIZE)
+        results['bitmaps'] = measure(bitmap_thumbnails, repeat)
+        results['bitmaps']['items'] = len(bitmaps)
+    return results
+
+
+def run(xd_path: str, repeat: int) -> Dict[str, Any]:
+    """Executa todas as etapas sobre um arquivo .xd"""
+    results: Dict[str, Any] = {'extract': bench_extract(xd_path, repeat)}
+    
+    extractor = XDContentExtractor(ArtboardExtractor(XDStructureAnalyzer()))
+    content = extractor.extract_content(xd_path)
+    archive = extractor.get_archive()
+    try:
+        artboards = [item for item in content if isinstance(item, dict) and item.get('type') in ARTBOARD_TYPES]
+        # Bitmaps embutidos (só aparecem no conteúdo quando o documento não tem artboards)
+        bitmaps = [path for path in ProjectIndex.build(archive).images_under(archive.root)
+                   if not path.lower().endswith('.svg')]
+        results['content'] = {'items': len(content), 'artboards': len(artboards), 'bitmaps': len(bitmaps)}
+        results['render_artboard'] = bench_render(archive, artboards, repeat)
+        if artboards:
+            results['zoom'] = bench_zoom(archive, artboards[0], repeat)
+        results['thumbnails'] = bench_thumbnails(archive, artboards, bitmaps, repeat)
+    finally:
+        extractor.cleanup()
+    return results
+
+
+def print_summary(results: Dict[str, Any], prefix: str = ''):
+    """Mediana de cada medida, legível, na saída de erro (o JSON fica na saída padrão ou no arquivo)"""
+    for name, value in results.items():
+        if isinstance(value, dict) and 'median' in value:
+            print(f"{prefix}{name:<{32 - len(prefix)}} {value['median'] * 1000:10.1f} ms", file=sys.stderr)
+        elif isinstance(value, dict):
+            print_summary(value, prefix + name + '.')
+
+
+def environment() -> Dict[str, Any]:
+    return {
+        'timestamp': datetime.now(timezone.utc).isoformat(),
+        'python': platform.python_version(),
+        'pillow': PIL.__version__,
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count()
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmarks de abertura, renderização, zoom e miniaturas")
+    parser.add_argument('-o', '--output', help="arquivo JSON de resultados (padrão: saída padrão)")
+    parser.add_argument('--xd', help="usar um .xd existente em vez de gerar um documento sintético")
+    parser.add_argument('-r', '--repeat', type=int, default=3, help="repetições de cada medida (padrão: 3)")
+    add_spec_arguments(parser)
+    args = parser.parse_args(argv)
+    if args.repeat < 1:
+        parser.error("--repeat deve ser ao menos 1")
+    
+    report: Dict[str, Any] = {'environment': environment(), 'repeat': args.repeat}
+    with tempfile.TemporaryDirectory(prefix='xd_bench_') as directory:
+        xd_path = args.xd
+        if xd_path is None:
+            xd_path = os.path.join(directory, 'synthetic.xd')
+            start = time.perf_counter()
+            report['corpus'] = generate_xd(xd_path, spec_from_args(args))
+            report['corpus']['generate_seconds'] = time.perf_counter() - start
+            report['corpus']['path'] = None
+        else:
+            report['corpus'] = {'path': os.path.abspath(xd_path), 'bytes': os.path.getsize(xd_path)}
+        report['results'] = run(xd_path, args.repeat)
+    print_summary(report['results'])
+    
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(output + '\n')
+        print(f"Resultados gravados em {args.output}", file=sys.stderr)
+    else:
+        print(output)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
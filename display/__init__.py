@@ -1,8 +1,20 @@
 """Módulo de exibição e renderização"""
 from .state import DisplayState
 from .controller import ImageDisplayController
-from .renderer import CanvasRenderer
 from .artboard_renderer import ArtboardRenderer
+from .disk_cache import DiskCache
+from .text_cache import FontCache, TextRunCache
 
-__all__ = ['DisplayState', 'ImageDisplayController', 'CanvasRenderer', 'ArtboardRenderer']
+__all__ = ['DisplayState', 'ImageDisplayController', 'CanvasRenderer', 'RenderScheduler', 'ArtboardRenderer', 'DiskCache', 'FontCache', 'TextRunCache']
 
+# Componentes do Tk importados sob demanda: usos sem interface (ex.: exportação) não dependem de tkinter
+_LAZY = {'CanvasRenderer': '.renderer', 'RenderScheduler': '.scheduler'}
+
+
+def __getattr__(name):
+    if name in _LAZY:
+        import importlib
+        value = getattr(importlib.import_module(_LAZY[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
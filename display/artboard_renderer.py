@@ -1,261 +1,272 @@
 """Renderizador de artboards XD (SRP)"""
 import os
-import json
-from typing import Dict, Any, Optional, Tuple, List
+from typing import Callable, Dict, Any, Optional, Tuple
 from PIL import Image, ImageDraw, ImageFont
-import tkinter as tk
+from interfaces import IResourceSource
+from .lru import LRUCache
+from .display_list import DisplayItem, DisplayList, DisplayListCompiler, ElementKind
+from .text_cache import FontCache, TextRunCache
+
+
+class RenderCancelled(Exception):
+    """Renderização interrompida porque should_cancel() retornou True"""
 
 
 class ArtboardRenderer:
-    """Renderiza artboards XD a partir de dados JSON (Single Responsibility)"""
+    """Renderiza artboards XD a partir de dados JSON (Single Responsibility)
+    
+    Fontes abertas e linhas de texto rasterizadas ficam em caches compartilhados
+    entre renderizadores. Bitmaps já decodificados, redimensionados e com
+    opacidade aplicada ficam em cache no próprio renderizador, que é reutilizado
+    por todos os artboards do documento (ver cache_stats()).
+    
+    Cada artboard é compilado uma única vez em uma DisplayList (primitivas com
+    coordenadas absolutas e cores já convertidas, indexadas espacialmente):
+    renderizar uma região desenha apenas as primitivas que a intersectam. Os
+    dados do artboard são tratados como imutáveis enquanto estiverem em cache.
+    
+    Se should_cancel for definido, é consultado a cada CANCEL_CHECK_ITEMS
+    primitivas; quando retorna True a renderização levanta RenderCancelled.
+    """
+    
+    BITMAP_CACHE_BYTES = 64 * 1024 * 1024
+    DISPLAY_LIST_CACHE_ITEMS = 16
+    # Folga (em pixels) da região consultada: arredondamentos e espessuras mínimas
+    REGION_MARGIN = 2
+    CANCEL_CHECK_ITEMS = 256
     
-    def __init__(self, base_directory: str):
+    def __init__(self, base_directory: str, resources: Optional[IResourceSource] = None,
+                 fonts: Optional[FontCache] = None, text_runs: Optional[TextRunCache] = None,
+                 bitmaps: Optional[LRUCache] = None):
         self.base_directory = base_directory
+        # Fonte dos arquivos referenciados (ex.: .xd aberto); None usa o sistema de arquivos
+        self.resources = resources
+        self.fonts = fonts or FontCache.shared()
+        self.text_runs = text_runs or TextRunCache.shared()
+        self.bitmaps = bitmaps if bitmaps is not None else LRUCache(max_bytes=self.BITMAP_CACHE_BYTES)
+        self._display_lists = LRUCache(max_items=self.DISPLAY_LIST_CACHE_ITEMS, sizeof=lambda entry: 0)
+        self._compiler = DisplayListCompiler(self._resolve_image)
+        # Desenho de cada primitiva, indexado por ElementKind
+        self._painters = {
+            ElementKind.RECTANGLE: self._render_rectangle,
+            ElementKind.CIRCLE: self._render_circle,
+            ElementKind.LINE: self._render_line,
+            ElementKind.TEXT: self._render_text,
+            ElementKind.IMAGE: self._render_image
+        }
         self.default_font = None
+        self._default_font_key = None
+        # Transformação do artboard para pixels da imagem gerada (escala e origem)
+        self._scale = 1.0
+        self._origin = (0.0, 0.0)
+        self.should_cancel: Optional[Callable[[], bool]] = None
         self._try_load_font()
     
     def _try_load_font(self):
         """Tenta carregar uma fonte padrão"""
-        try:
-            # Tentar carregar fonte do sistema
-            self.default_font = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf", 12)
-        except:
-            try:
-                self.default_font = ImageFont.truetype("/usr/share/fonts/truetype/liberation/LiberationSans-Regular.ttf", 12)
-            except:
-                # Fonte padrão do PIL
-                self.default_font = ImageFont.load_default()
+        # Tentar carregar fonte do sistema
+        self._default_font_key, self.default_font = self.fonts.get(12)
+        if self.default_font is None:
+            # Fonte padrão do PIL
+            self._default_font_key, self.default_font = ('default',), ImageFont.load_default()
+    
+    def cache_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Acertos e falhas dos caches de fontes, texto e bitmaps"""
+        return {'fonts': self.fonts.stats(), 'text_runs': self.text_runs.stats(), 'bitmaps': self.bitmaps.stats()}
     
-    def render_artboard(self, artboard_data: Dict[str, Any], width: Optional[int] = None, height: Optional[int] = None) -> Image.Image:
-        """Renderiza um artboard completo a partir de dados JSON"""
+    def render_artboard(self, artboard_data: Dict[str, Any], width: Optional[int] = None, height: Optional[int] = None,
+                        scale: float = 1.0) -> Image.Image:
+        """Renderiza um artboard completo a partir de dados JSON
+        
+        Com scale < 1 o artboard é desenhado diretamente no tamanho reduzido
+        (ex.: miniaturas), sem renderizar em tamanho real para depois reduzir.
+        """
         # Obter dimensões do artboard
         artboard_width = width or artboard_data.get('width', artboard_data.get('w', 800))
         artboard_height = height or artboard_data.get('height', artboard_data.get('h', 600))
         
+        size = (max(1, int(artboard_width * scale)), max(1, int(artboard_height * scale)))
+        return self._render(artboard_data, artboard_width, artboard_height, scale, (0, 0, size[0], size[1]))
+    
+    def render_region(self, artboard_data: Dict[str, Any], box: Tuple[int, int, int, int], scale: float,
+                      width: Optional[int] = None, height: Optional[int] = None) -> Image.Image:
+        """Renderiza apenas uma região do artboard na escala pedida
+        
+        box é dado em pixels do artboard já escalado (como em render_artboard(scale=scale)),
+        permitindo rasterizar diretamente em zoom alto sem gerar a imagem inteira.
+        """
+        artboard_width = width or artboard_data.get('width', artboard_data.get('w', 800))
+        artboard_height = height or artboard_data.get('height', artboard_data.get('h', 600))
+        return self._render(artboard_data, artboard_width, artboard_height, scale, box)
+    
+    def _render(self, artboard_data: Dict[str, Any], artboard_width: float, artboard_height: float,
+                scale: float, box: Tuple[int, int, int, int]) -> Image.Image:
+        """Desenha a região box (em pixels escalados) do artboard"""
+        display_list = self.get_display_list(artboard_data)
+        
         # Criar imagem base
-        image = Image.new('RGBA', (int(artboard_width), int(artboard_height)), (255, 255, 255, 255))
+        size = (max(1, box[2] - box[0]), max(1, box[3] - box[1]))
+        image = Image.new('RGBA', size, (255, 255, 255, 255))
         draw = ImageDraw.Draw(image)
+        self._scale = scale
+        self._origin = origin_x, origin_y = (float(box[0]), float(box[1]))
         
         # Renderizar background do artboard
-        bg_color = self._parse_color(artboard_data.get('backgroundColor', artboard_data.get('bgColor', '#FFFFFF')))
-        if bg_color:
-            draw.rectangle([(0, 0), (artboard_width, artboard_height)], fill=bg_color)
+        if display_list.background:
+            draw.rectangle([self._point(0, 0), self._point(artboard_width, artboard_height)], fill=display_list.background)
         
-        # Renderizar elementos filhos
-        children = artboard_data.get('children', artboard_data.get('elements', artboard_data.get('content', [])))
-        if isinstance(children, list):
-            for child in children:
-                self._render_element(draw, child, image)
+        # Renderizar apenas as primitivas que intersectam a região
+        margin = self.REGION_MARGIN
+        region = ((box[0] - margin) / scale, (box[1] - margin) / scale,
+                  (box[2] + margin) / scale, (box[3] + margin) / scale)
+        items, painters, should_cancel = display_list.items, self._painters, self.should_cancel
+        for count, i in enumerate(display_list.index.query(region)):
+            if should_cancel is not None and count % self.CANCEL_CHECK_ITEMS == 0 and should_cancel():
+                raise RenderCancelled()
+            item = items[i]
+            # Geometria em pixels da imagem gerada
+            painters[item.kind](draw, image, item, item.x * scale - origin_x, item.y * scale - origin_y,
+                                item.width * scale, item.height * scale)
         
         return image
     
-    def _render_element(self, draw: ImageDraw.Draw, element: Dict[str, Any], canvas_image: Image.Image):
-        """Renderiza um elemento individual"""
-        if not isinstance(element, dict):
-            return
-        
-        element_type = str(element.get('type', '')).lower()
-        
-        # Aplicar transformações (posição, rotação, escala, opacidade)
-        x = element.get('x', element.get('left', 0))
-        y = element.get('y', element.get('top', 0))
-        width = element.get('width', element.get('w', 0))
-        height = element.get('height', element.get('h', 0))
-        rotation = element.get('rotation', element.get('r', 0))
-        opacity = element.get('opacity', element.get('alpha', 1.0))
-        
-        # Renderizar baseado no tipo
-        if 'rectangle' in element_type or 'rect' in element_type:
-            self._render_rectangle(draw, x, y, width, height, element, opacity)
-        elif 'circle' in element_type or 'ellipse' in element_type:
-            self._render_circle(draw, x, y, width, height, element, opacity)
-        elif 'line' in element_type or 'path' in element_type:
-            self._render_line(draw, x, y, width, height, element, opacity)
-        elif 'text' in element_type or 'string' in element_type:
-            self._render_text(draw, x, y, width, height, element, opacity)
-        elif 'image' in element_type or 'bitmap' in element_type or 'picture' in element_type:
-            self._render_image(draw, x, y, width, height, element, canvas_image, opacity)
-        elif 'group' in element_type or 'container' in element_type:
-            # Renderizar grupo recursivamente
-            children = element.get('children', element.get('elements', element.get('content', [])))
-            if isinstance(children, list):
-                for child in children:
-                    # Ajustar posição relativa ao grupo
-                    child_x = child.get('x', child.get('left', 0)) + x
-                    child_y = child.get('y', child.get('top', 0)) + y
-                    child_copy = child.copy()
-                    child_copy['x'] = child_x
-                    child_copy['y'] = child_y
-                    self._render_element(draw, child_copy, canvas_image)
+    def get_display_list(self, artboard_data: Dict[str, Any]) -> DisplayList:
+        """Artboard compilado (em cache por artboard)"""
+        entry = self._display_lists.get(id(artboard_data))
+        # A entrada mantém o artboard vivo, então o id não é reutilizado enquanto estiver em cache
+        if entry is None or entry[0] is not artboard_data:
+            entry = (artboard_data, self._compiler.compile(artboard_data))
+            self._display_lists.put(id(artboard_data), entry)
+        return entry[1]
     
-    def _render_rectangle(self, draw: ImageDraw.Draw, x: float, y: float, width: float, height: float, 
-                         element: Dict[str, Any], opacity: float):
+    def _resolve_image(self, image_path: str) -> Optional[str]:
+        """Localiza o arquivo de um bitmap referenciado pelo artboard"""
+        exists = self.resources.exists if self.resources else os.path.exists
+        full_path = os.path.join(self.base_directory, image_path)
+        if not exists(full_path):
+            # Tentar caminho relativo
+            full_path = os.path.normpath(os.path.join(self.base_directory, image_path.lstrip('/')))
+        return full_path if exists(full_path) else None
+    
+    def _point(self, x: float, y: float) -> Tuple[float, float]:
+        """Converte coordenadas do artboard em pixels da imagem"""
+        return x * self._scale - self._origin[0], y * self._scale - self._origin[1]
+    
+    def _pixels(self, length: float) -> int:
+        """Converte uma espessura/tamanho do artboard em pixels inteiros (mínimo 1 quando reduzido)"""
+        if self._scale >= 1.0:
+            return int(length * self._scale)
+        return max(1, int(length * self._scale)) if int(length) > 0 else 0
+    
+    def _render_rectangle(self, draw: ImageDraw.Draw, canvas_image: Image.Image, item: DisplayItem,
+                          x: float, y: float, width: float, height: float):
         """Renderiza um retângulo"""
-        fill_color = self._parse_color(element.get('fill', element.get('color', '#000000')))
-        stroke_color = self._parse_color(element.get('stroke', element.get('borderColor')))
-        stroke_width = element.get('strokeWidth', element.get('borderWidth', 0))
+        if item.fill:
+            draw.rectangle([(x, y), (x + width, y + height)], fill=item.fill)
         
-        if fill_color:
-            fill_color = self._apply_opacity(fill_color, opacity)
-            draw.rectangle([(x, y), (x + width, y + height)], fill=fill_color)
-        
-        if stroke_color and stroke_width > 0:
-            stroke_color = self._apply_opacity(stroke_color, opacity)
-            for i in range(int(stroke_width)):
-                draw.rectangle([(x + i, y + i), (x + width - i, y + height - i)], outline=stroke_color)
+        if item.stroke:
+            for i in range(self._pixels(item.stroke_width)):
+                draw.rectangle([(x + i, y + i), (x + width - i, y + height - i)], outline=item.stroke)
     
-    def _render_circle(self, draw: ImageDraw.Draw, x: float, y: float, width: float, height: float,
-                      element: Dict[str, Any], opacity: float):
+    def _render_circle(self, draw: ImageDraw.Draw, canvas_image: Image.Image, item: DisplayItem,
+                       x: float, y: float, width: float, height: float):
         """Renderiza um círculo/elipse"""
-        fill_color = self._parse_color(element.get('fill', element.get('color', '#000000')))
-        stroke_color = self._parse_color(element.get('stroke', element.get('borderColor')))
-        stroke_width = element.get('strokeWidth', element.get('borderWidth', 0))
-        
-        # Calcular centro e raios
-        center_x = x + width / 2
-        center_y = y + height / 2
-        radius_x = width / 2
-        radius_y = height / 2
-        
-        # PIL não tem elipse direta, usar aproximação com polígono
         bbox = [(x, y), (x + width, y + height)]
         
-        if fill_color:
-            fill_color = self._apply_opacity(fill_color, opacity)
-            draw.ellipse(bbox, fill=fill_color)
+        if item.fill:
+            draw.ellipse(bbox, fill=item.fill)
         
-        if stroke_color and stroke_width > 0:
-            stroke_color = self._apply_opacity(stroke_color, opacity)
-            draw.ellipse(bbox, outline=stroke_color, width=int(stroke_width))
+        if item.stroke:
+            draw.ellipse(bbox, outline=item.stroke, width=self._pixels(item.stroke_width))
     
-    def _render_line(self, draw: ImageDraw.Draw, x: float, y: float, width: float, height: float,
-                    element: Dict[str, Any], opacity: float):
+    def _render_line(self, draw: ImageDraw.Draw, canvas_image: Image.Image, item: DisplayItem,
+                     x: float, y: float, width: float, height: float):
         """Renderiza uma linha"""
-        stroke_color = self._parse_color(element.get('stroke', element.get('color', '#000000')))
-        stroke_width = element.get('strokeWidth', element.get('width', 1))
-        
-        if stroke_color:
-            stroke_color = self._apply_opacity(stroke_color, opacity)
-            # Se tem path, renderizar path
-            path = element.get('path', element.get('d', []))
-            if path and isinstance(path, list) and len(path) >= 2:
-                points = [(p.get('x', 0) + x, p.get('y', 0) + y) if isinstance(p, dict) else (p[0] + x, p[1] + y) if isinstance(p, (list, tuple)) else (x, y) for p in path]
-                if len(points) >= 2:
-                    draw.line(points, fill=stroke_color, width=int(stroke_width))
-            else:
-                # Linha simples
-                end_x = element.get('x2', x + width)
-                end_y = element.get('y2', y + height)
-                draw.line([(x, y), (end_x, end_y)], fill=stroke_color, width=int(stroke_width))
+        if item.points is not None:
+            # Path (pontos relativos à posição do elemento)
+            s = self._scale
+            points = [(u * s + x, v * s + y) for u, v in item.points]
+            draw.line(points, fill=item.stroke, width=self._pixels(item.stroke_width))
+        else:
+            # Linha simples (x2/y2 estão em coordenadas do artboard)
+            end_x, end_y = x + width, y + height
+            if item.end_x is not None or item.end_y is not None:
+                artboard_x2, artboard_y2 = self._point(item.end_x or 0, item.end_y or 0)
+                end_x = artboard_x2 if item.end_x is not None else end_x
+                end_y = artboard_y2 if item.end_y is not None else end_y
+            draw.line([(x, y), (end_x, end_y)], fill=item.stroke, width=self._pixels(item.stroke_width))
     
-    def _render_text(self, draw: ImageDraw.Draw, x: float, y: float, width: float, height: float,
-                    element: Dict[str, Any], opacity: float):
+    def _render_text(self, draw: ImageDraw.Draw, canvas_image: Image.Image, item: DisplayItem,
+                     x: float, y: float, width: float, height: float):
         """Renderiza texto"""
-        text = element.get('text', element.get('content', element.get('string', '')))
-        if not text:
-            return
+        font_size = item.font_size * self._scale
+        font_pixels = int(font_size) if self._scale >= 1.0 else max(1, int(font_size))
         
-        text_color = self._parse_color(element.get('fill', element.get('color', '#000000')))
-        font_size = element.get('fontSize', element.get('size', 12))
+        # Fonte em cache por (arquivo, tamanho)
+        font_key, font = self.fonts.get(font_pixels)
+        if font is None:
+            font_key, font = self._default_font_key, self.default_font
         
-        # Tentar carregar fonte
-        try:
-            font = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf", int(font_size))
-        except:
-            try:
-                font = ImageFont.truetype("/usr/share/fonts/truetype/liberation/LiberationSans-Regular.ttf", int(font_size))
-            except:
-                font = self.default_font
-        
-        if text_color:
-            text_color = self._apply_opacity(text_color, opacity)
-            # Renderizar texto (multiline se necessário)
-            lines = str(text).split('\n')
-            current_y = y
-            for line in lines:
-                draw.text((x, current_y), line, fill=text_color, font=font)
-                # Aproximar altura da linha
-                current_y += font_size * 1.2
+        # Renderizar texto (multiline se necessário)
+        current_y = y
+        for line in item.lines:
+            self.text_runs.draw(canvas_image, (x, current_y), line, item.fill, font, font_key)
+            # Aproximar altura da linha
+            current_y += font_size * 1.2
     
-    def _render_image(self, draw: ImageDraw.Draw, x: float, y: float, width: float, height: float,
-                     element: Dict[str, Any], canvas_image: Image.Image, opacity: float):
+    def _render_image(self, draw: ImageDraw.Draw, canvas_image: Image.Image, item: DisplayItem,
+                      x: float, y: float, width: float, height: float):
         """Renderiza uma imagem"""
-        # Procurar referência à imagem
-        image_path = element.get('href', element.get('src', element.get('path', element.get('file', ''))))
-        if not image_path:
-            return
-        
-        # Tentar encontrar o arquivo de imagem
-        full_path = os.path.join(self.base_directory, image_path)
-        if not os.path.exists(full_path):
-            # Tentar caminho relativo
-            full_path = os.path.normpath(os.path.join(self.base_directory, image_path.lstrip('/')))
-        
-        if os.path.exists(full_path):
-            try:
-                img = Image.open(full_path)
-                # Redimensionar se necessário
-                if width > 0 and height > 0:
-                    img = img.resize((int(width), int(height)), Image.Resampling.LANCZOS)
-                
-                # Aplicar opacidade
-                if opacity < 1.0:
-                    alpha = img.split()[3] if img.mode == 'RGBA' else None
-                    if alpha:
-                        alpha = alpha.point(lambda p: int(p * opacity))
-                        img.putalpha(alpha)
-                    else:
-                        img = img.convert('RGBA')
-                        alpha = img.split()[3]
-                        alpha = alpha.point(lambda p: int(p * opacity))
-                        img.putalpha(alpha)
-                
-                # Colar na imagem do canvas
-                canvas_image.paste(img, (int(x), int(y)), img if img.mode == 'RGBA' else None)
-            except Exception:
-                pass  # Ignorar erros ao carregar imagem
+        try:
+            size = None
+            if width > 0 and height > 0:
+                size = (int(width), int(height)) if self._scale >= 1.0 else (max(1, int(width)), max(1, int(height)))
+            
+            # Em zoom alto, reamostrar só a parte do bitmap que cai na imagem gerada
+            # Arredondamento feito em coordenadas absolutas: regiões vizinhas colam no mesmo pixel
+            origin_x, origin_y = int(self._origin[0]), int(self._origin[1])
+            position = (int(x + origin_x) - origin_x, int(y + origin_y) - origin_y)
+            clip = None
+            if size is not None and self._scale > 1.0:
+                clip = (max(0, -position[0]), max(0, -position[1]),
+                        min(size[0], canvas_image.size[0] - position[0]),
+                        min(size[1], canvas_image.size[1] - position[1]))
+                if clip[2] <= clip[0] or clip[3] <= clip[1]:
+                    return
+                if clip == (0, 0) + size:
+                    clip = None
+                else:
+                    position = (position[0] + clip[0], position[1] + clip[1])
+            
+            key = (os.path.normpath(item.path), size, item.opacity, clip)
+            img = self.bitmaps.get(key)
+            if img is None:
+                img = self._load_bitmap(item.path, size, item.opacity, clip)
+                self.bitmaps.put(key, img)
+            
+            # Colar na imagem do canvas
+            canvas_image.paste(img, position, img if img.mode == 'RGBA' else None)
+        except Exception:
+            pass  # Ignorar erros ao carregar imagem
     
-    def _parse_color(self, color_value: Any) -> Optional[Tuple[int, int, int, int]]:
-        """Converte valor de cor para RGBA tuple"""
-        if color_value is None:
-            return None
+    def _load_bitmap(self, full_path: str, size: Optional[Tuple[int, int]], opacity: float,
+                     clip: Optional[Tuple[int, int, int, int]] = None) -> Image.Image:
+        """Decodifica o bitmap, redimensiona (só o recorte clip, se dado) e aplica a opacidade"""
+        img = Image.open(self.resources.open(full_path) if self.resources else full_path)
+        # Redimensionar se necessário
+        if clip is not None:
+            ratio_x, ratio_y = img.size[0] / size[0], img.size[1] / size[1]
+            source_box = (clip[0] * ratio_x, clip[1] * ratio_y, clip[2] * ratio_x, clip[3] * ratio_y)
+            img = img.resize((clip[2] - clip[0], clip[3] - clip[1]), Image.Resampling.LANCZOS, box=source_box)
+        elif size is not None:
+            img = img.resize(size, Image.Resampling.LANCZOS)
+        else:
+            img.load()
         
-        if isinstance(color_value, str):
-            # Hex color (#RRGGBB ou #RRGGBBAA)
-            if color_value.startswith('#'):
-                hex_color = color_value[1:]
-                if len(hex_color) == 6:
-                    return (int(hex_color[0:2], 16), int(hex_color[2:4], 16), int(hex_color[4:6], 16), 255)
-                elif len(hex_color) == 8:
-                    return (int(hex_color[0:2], 16), int(hex_color[2:4], 16), int(hex_color[4:6], 16), int(hex_color[6:8], 16))
-            # RGB/RGBA string
-            elif color_value.startswith('rgb'):
-                # Simplificado - retornar preto
-                return (0, 0, 0, 255)
-        
-        elif isinstance(color_value, dict):
-            # Objeto de cor {r, g, b, a}
-            r = int(color_value.get('r', color_value.get('red', 0)) * 255) if isinstance(color_value.get('r', 0), float) else color_value.get('r', 0)
-            g = int(color_value.get('g', color_value.get('green', 0)) * 255) if isinstance(color_value.get('g', 0), float) else color_value.get('g', 0)
-            b = int(color_value.get('b', color_value.get('blue', 0)) * 255) if isinstance(color_value.get('b', 0), float) else color_value.get('b', 0)
-            a = int(color_value.get('a', color_value.get('alpha', 1.0)) * 255) if isinstance(color_value.get('a', 1.0), float) else color_value.get('a', 255)
-            return (r, g, b, a)
-        
-        elif isinstance(color_value, (list, tuple)):
-            # Lista/tupla [r, g, b] ou [r, g, b, a]
-            if len(color_value) >= 3:
-                r = int(color_value[0] * 255) if isinstance(color_value[0], float) else color_value[0]
-                g = int(color_value[1] * 255) if isinstance(color_value[1], float) else color_value[1]
-                b = int(color_value[2] * 255) if isinstance(color_value[2], float) else color_value[2]
-                a = int(color_value[3] * 255) if len(color_value) > 3 and isinstance(color_value[3], float) else (color_value[3] if len(color_value) > 3 else 255)
-                return (r, g, b, a)
-        
-        # Fallback: preto
-        return (0, 0, 0, 255)
-    
-    def _apply_opacity(self, color: Tuple[int, int, int, int], opacity: float) -> Tuple[int, int, int, int]:
-        """Aplica opacidade a uma cor"""
-        if len(color) == 4:
-            return (color[0], color[1], color[2], int(color[3] * opacity))
-        return color + (int(255 * opacity),)
-
+        # Aplicar opacidade com tabela pré-calculada
+        if opacity < 1.0:
+            if img.mode != 'RGBA':
+                img = img.convert('RGBA')
+            lookup = [int(p * opacity) for p in range(256)]
+            img.putalpha(img.getchannel('A').point(lookup))
+        return img
@@ -1,78 +1,428 @@
 """Controlador de exibição (SRP)"""
+import json
+import math
 import os
-from typing import Optional, Tuple, Dict, Any, Union
+from typing import Optional, Tuple, Dict, Any, Hashable, Union, List
 from PIL import Image
+from interfaces import IResourceSource
 from .state import DisplayState
-from .artboard_renderer import ArtboardRenderer
+from .artboard_renderer import ArtboardRenderer, RenderCancelled
+from .disk_cache import DiskCache, artboard_content_key
+from .lru import LRUCache
+from .prefetcher import Prefetcher
 
 
 class ImageDisplayController:
-    """Controla zoom, pan e interações com imagem e artboards (Single Responsibility)"""
+    """Controla zoom, pan e interações com imagem e artboards (Single Responsibility)
     
-    def __init__(self, display_state: DisplayState):
+    Imagens decodificadas e artboards renderizados ficam em um cache LRU em
+    memória, limitado por bytes e indexado pela identidade do conteúdo: voltar
+    a um item exibido há pouco não decodifica nem renderiza de novo.
+    
+    Após exibir um item, prefetch_neighbours() prepara em segundo plano os
+    itens vizinhos em um cache próprio (limitado a prefetch_cache_bytes, sem
+    descartar o que já foi exibido). O renderizador de artboards guarda estado
+    por renderização, então a thread de fundo usa uma instância própria (que
+    compartilha os bitmaps decodificados) e nunca bloqueia a exibição.
+    """
+    
+    # Modos suportados por Image.reduce
+    REDUCIBLE_MODES = {'L', 'LA', 'RGB', 'RGBA', 'I', 'F'}
+    # Rasterização vetorial de artboards acima de 1x: blocos por faixa de zoom (meia oitava)
+    VECTOR_TILE_SIZE = 512
+    VECTOR_CACHE_BYTES = 64 * 1024 * 1024
+    ZOOM_BUCKETS_PER_OCTAVE = 2
+    RENDER_CACHE_BYTES = 256 * 1024 * 1024
+    PREFETCH_CACHE_BYTES = 128 * 1024 * 1024
+    # Quantos itens antes e depois do atual são preparados
+    PREFETCH_DISTANCE = 1
+    IDENTITY_CACHE_ITEMS = 256
+    # Artboards maiores que isso não vão para o cache em disco (PNG grande demais para compensar)
+    DISK_CACHE_MAX_PIXELS = 4096 * 4096
+    
+    def __init__(self, display_state: DisplayState, disk_cache: Optional[DiskCache] = None,
+                 render_cache_bytes: int = RENDER_CACHE_BYTES, prefetch_cache_bytes: int = PREFETCH_CACHE_BYTES):
         self.display_state = display_state
+        # Cache persistente dos artboards renderizados (opcional)
+        self.disk_cache = disk_cache
+        # Imagens prontas para exibição, por identidade do conteúdo
+        self.render_cache = LRUCache(max_bytes=render_cache_bytes)
+        # Itens vizinhos preparados especulativamente, ainda não exibidos
+        self.prefetch_cache = LRUCache(max_bytes=prefetch_cache_bytes)
+        self.prefetcher = Prefetcher()
         self.original_image: Optional[Image.Image] = None
         self.content_type: str = 'image'  # 'image' ou 'artboard'
         self.artboard_renderer: Optional[ArtboardRenderer] = None
+        # Renderizador exclusivo da thread de pré-carregamento
+        self._prefetch_renderer: Optional[ArtboardRenderer] = None
         self.base_directory: Optional[str] = None
+        # Fonte dos arquivos do documento atual (None usa o sistema de arquivos)
+        self.resources: Optional[IResourceSource] = None
+        # Pirâmide de resoluções: o nível k é a imagem original reduzida por 2**k
+        self._pyramid: List[Image.Image] = []
+        # Artboard atual, re-rasterizado na escala do zoom quando ampliado
+        self.vector_zoom = True
+        self._artboard: Optional[Tuple[Dict[str, Any], float, float]] = None
+        self._vector_tiles = LRUCache(max_bytes=self.VECTOR_CACHE_BYTES)
+        # Identidades já calculadas de artboards sem arquivo de origem, por id() do dicionário
+        self._identities = LRUCache(max_items=self.IDENTITY_CACHE_ITEMS, sizeof=lambda entry: 0)
+    
+    def _set_image(self, image: Image.Image, artboard: Optional[Tuple[Dict[str, Any], float, float]] = None):
+        """Define a imagem exibida e descarta a pirâmide e os blocos vetoriais do item anterior"""
+        self.original_image = image
+        self._pyramid = [image]
+        self._artboard = artboard
+        self._vector_tiles.clear()
+    
+    def reset_caches(self):
+        """Descarta os níveis da pirâmide e os blocos vetoriais da imagem atual (a imagem continua exibida)"""
+        self._pyramid = [self.original_image] if self.original_image is not None else []
+        self._vector_tiles.clear()
+    
+    def get_pyramid_level(self, scale: float) -> Tuple[Image.Image, int]:
+        """Retorna o menor nível da pirâmide com resolução >= escala pedida e seu fator de redução"""
+        level = 0
+        while 2 ** (level + 1) * scale <= 1.0:
+            level += 1
+        
+        # Construção preguiçosa: cada nível é gerado a partir do anterior
+        while len(self._pyramid) <= level:
+            previous = self._pyramid[-1]
+            if min(previous.size) < 2:
+                break
+            if previous.mode not in self.REDUCIBLE_MODES:
+                previous = previous.convert('RGBA')
+            self._pyramid.append(previous.reduce(2))
+        
+        level = min(level, len(self._pyramid) - 1)
+        return self._pyramid[level], 2 ** level
+    
+    def resample_region(self, scaled_size: Tuple[int, int], box: Tuple[int, int, int, int],
+                        resample: int = Image.Resampling.LANCZOS, rasterize: bool = True) -> Image.Image:
+        """Reamostra uma região (em coordenadas da imagem escalada) a partir do nível mais próximo da pirâmide
+        
+        Artboards ampliados (escala > 1) são re-rasterizados a partir do vetor, se
+        rasterize=True (ex.: desligado nas prévias durante a interação).
+        """
+        scaled_width, scaled_height = scaled_size
+        if rasterize and self.vector_zoom and self._artboard is not None and scaled_width > self.original_image.size[0]:
+            return self._rasterize_region(scaled_size, box, resample)
+        source, _ = self.get_pyramid_level(scaled_width / self.original_image.size[0])
+        
+        ratio_x = source.size[0] / scaled_width
+        ratio_y = source.size[1] / scaled_height
+        if ratio_x == 1.0 and ratio_y == 1.0:
+            # Escala coincide com um nível da pirâmide: basta recortar
+            return source.crop(box)
+        
+        source_box = (box[0] * ratio_x, box[1] * ratio_y, box[2] * ratio_x, box[3] * ratio_y)
+        return source.resize((box[2] - box[0], box[3] - box[1]), resample, box=source_box)
+    
+    @classmethod
+    def zoom_bucket(cls, scale: float) -> float:
+        """Menor escala da grade de faixas (2 ** (k / ZOOM_BUCKETS_PER_OCTAVE)) que é >= scale"""
+        steps = math.ceil(math.log2(scale) * cls.ZOOM_BUCKETS_PER_OCTAVE - 1e-9)
+        return 2 ** (steps / cls.ZOOM_BUCKETS_PER_OCTAVE)
+    
+    def _rasterize_region(self, scaled_size: Tuple[int, int], box: Tuple[int, int, int, int],
+                          resample: int) -> Image.Image:
+        """Rasteriza a região na faixa de zoom e a ajusta à escala exata pedida
+        
+        Os blocos da faixa ficam em cache: zooms dentro da mesma faixa e o pan
+        reaproveitam o que já foi rasterizado.
+        """
+        artboard_dict, width, height = self._artboard
+        scale_x = scaled_size[0] / self.original_image.size[0]
+        scale_y = scaled_size[1] / self.original_image.size[1]
+        bucket = self.zoom_bucket(max(scale_x, scale_y))
+        bucket_width = max(1, int(width * bucket))
+        bucket_height = max(1, int(height * bucket))
+        
+        # Região pedida em pixels da faixa
+        ratio_x, ratio_y = bucket / scale_x, bucket / scale_y
+        source_box = (box[0] * ratio_x, box[1] * ratio_y,
+                      min(box[2] * ratio_x, bucket_width), min(box[3] * ratio_y, bucket_height))
+        
+        tile = self.VECTOR_TILE_SIZE
+        first_col, last_col = int(source_box[0] // tile), int((math.ceil(source_box[2]) - 1) // tile)
+        first_row, last_row = int(source_box[1] // tile), int((math.ceil(source_box[3]) - 1) // tile)
+        region_left, region_top = first_col * tile, first_row * tile
+        region = Image.new('RGBA', (
+            min((last_col + 1) * tile, bucket_width) - region_left,
+            min((last_row + 1) * tile, bucket_height) - region_top
+        ))
+        for row in range(first_row, last_row + 1):
+            for col in range(first_col, last_col + 1):
+                key = (bucket, col, row)
+                tile_image = self._vector_tiles.get(key)
+                if tile_image is None:
+                    tile_box = (col * tile, row * tile,
+                                min((col + 1) * tile, bucket_width), min((row + 1) * tile, bucket_height))
+                    tile_image = self._get_artboard_renderer(self.base_directory).render_region(
+                        artboard_dict, tile_box, bucket, width, height
+                    )
+                    self._vector_tiles.put(key, tile_image)
+                region.paste(tile_image, (col * tile - region_left, row * tile - region_top))
+        
+        local_box = (source_box[0] - region_left, source_box[1] - region_top,
+                     source_box[2] - region_left, source_box[3] - region_top)
+        target_size = (box[2] - box[0], box[3] - box[1])
+        if ratio_x == 1.0 and ratio_y == 1.0 and all(float(v).is_integer() for v in local_box):
+            # Escala coincide com a faixa: basta recortar
+            return region.crop(tuple(int(v) for v in local_box))
+        return region.resize(target_size, resample, box=local_box)
+    
+    def cache_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Acertos e falhas dos caches de imagens prontas, pré-carregadas e de blocos vetoriais"""
+        return {
+            'render': self.render_cache.stats(),
+            'prefetch': dict(self.prefetch_cache.stats(), **self.prefetcher.stats()),
+            'vector_tiles': self._vector_tiles.stats()
+        }
     
     def load_image(self, image_path: str):
         """Carrega uma nova imagem"""
         try:
-            self.original_image = Image.open(image_path)
+            resources = self.resources
+            cache_key = self._image_cache_key(image_path, resources)
+            image = self._take_cached(cache_key)
+            if image is None:
+                image = self._open_image(image_path, resources)
+                if cache_key:
+                    # Decodificar agora: a imagem em cache não depende mais do arquivo
+                    image.load()
+                    self.render_cache.put(cache_key, image)
+            self._set_image(image)
             self.content_type = 'image'
             self.display_state.reset()
         except Exception as e:
             raise ValueError(f"Erro ao carregar imagem: {str(e)}")
     
-    def load_artboard(self, artboard_data: Union[Dict[str, Any], str], base_directory: str):
-        """Carrega um artboard a partir de dados JSON"""
+    def load_artboard(self, artboard_data: Union[Dict[str, Any], str], base_directory: str,
+                      member: Optional[str] = None):
+        """Carrega um artboard a partir de dados JSON
+        
+        member é o arquivo JSON de onde os dados vieram (se houver): identifica o
+        artboard nos caches sem percorrer os dados.
+        """
         try:
             self.base_directory = base_directory
+            resources = self.resources
+            artboard_dict = self._read_artboard(artboard_data, resources)
             
-            # Se artboard_data é um dicionário, usar diretamente
-            if isinstance(artboard_data, dict):
-                artboard_dict = artboard_data
-            else:
-                # Se é string (caminho), tentar carregar do arquivo
-                import json
-                with open(artboard_data, 'r', encoding='utf-8') as f:
-                    artboard_dict = json.load(f)
-            
-            # Criar renderizador se necessário
-            if self.artboard_renderer is None or self.artboard_renderer.base_directory != base_directory:
-                self.artboard_renderer = ArtboardRenderer(base_directory)
-            
-            # Renderizar artboard
             width = artboard_dict.get('width', artboard_dict.get('w', 800))
             height = artboard_dict.get('height', artboard_dict.get('h', 600))
-            self.original_image = self.artboard_renderer.render_artboard(artboard_dict, width, height)
+            identity = self._artboard_identity(artboard_dict, resources, member or self._artboard_member(artboard_data))
+            memory_key = ('artboard', identity, width, height) if identity else None
+            image = self._take_cached(memory_key)
+            if image is None:
+                renderer = self._get_artboard_renderer(base_directory)
+                image = self._produce_artboard_image(artboard_dict, width, height, renderer, identity, resources)
+                if memory_key:
+                    self.render_cache.put(memory_key, image)
+            self._set_image(image, (artboard_dict, width, height))
             self.content_type = 'artboard'
             self.display_state.reset()
         except Exception as e:
             raise ValueError(f"Erro ao carregar artboard: {str(e)}")
     
-    def load_content(self, content: Union[str, Dict[str, Any]], base_directory: Optional[str] = None):
-        """Carrega conteúdo (imagem ou artboard) baseado no tipo"""
+    def _take_cached(self, key: Optional[Hashable]) -> Optional[Image.Image]:
+        """Imagem já pronta: do cache em memória ou, se pré-carregada, movida para ele"""
+        if key is None:
+            return None
+        image = self.render_cache.get(key)
+        if image is None:
+            image = self.prefetch_cache.get(key)
+            if image is not None:
+                self.prefetch_cache.pop(key)
+                self.render_cache.put(key, image)
+        return image
+    
+    def _produce_artboard_image(self, artboard_dict: Dict[str, Any], width: int, height: int,
+                                renderer: ArtboardRenderer, identity: Optional[str],
+                                resources: Optional[IResourceSource]) -> Optional[Image.Image]:
+        """Lê o artboard do cache em disco ou o renderiza em tamanho real com renderer
+        
+        O raster em tamanho real (e não uma prévia reduzida) é o que a exibição e o
+        zoom usam como 1x; lê-lo do disco custa dezenas de ms contra segundos de
+        renderização em artboards pesados.
+        
+        Retorna None se o documento mudou desde que resources foi obtido.
+        """
+        disk_key = None
+        if identity and self.disk_cache and width * height <= self.DISK_CACHE_MAX_PIXELS:
+            disk_key = self.disk_cache.key('artboard', identity, width, height)
+        image = self.disk_cache.get_image(disk_key) if disk_key else None
+        if image is None:
+            if self.resources is not resources:
+                return None
+            image = renderer.render_artboard(artboard_dict, width, height)
+            if disk_key:
+                # Imagens em cache não são alteradas: a gravação segue em segundo plano
+                self.disk_cache.put_image_async(disk_key, image)
+        return image
+    
+    def _get_artboard_renderer(self, base_directory: str) -> ArtboardRenderer:
+        """Retorna o renderizador do documento (thread do Tk), recriando-o se o documento mudou"""
+        renderer = self.artboard_renderer
+        if renderer is None or renderer.base_directory != base_directory or renderer.resources is not self.resources:
+            renderer = self.artboard_renderer = self._new_renderer(base_directory, self.resources,
+                                                                   self._prefetch_renderer)
+        return renderer
+    
+    def _get_prefetch_renderer(self, base_directory: str, resources: Optional[IResourceSource]) -> ArtboardRenderer:
+        """Retorna o renderizador da thread de pré-carregamento, recriando-o se o documento mudou"""
+        renderer = self._prefetch_renderer
+        if renderer is None or renderer.base_directory != base_directory or renderer.resources is not resources:
+            renderer = self._prefetch_renderer = self._new_renderer(base_directory, resources,
+                                                                    self.artboard_renderer)
+            # Abandona a especulação assim que a seleção muda
+            renderer.should_cancel = self.prefetcher.superseded
+        return renderer
+    
+    @staticmethod
+    def _new_renderer(base_directory: str, resources: Optional[IResourceSource],
+                      other: Optional[ArtboardRenderer]) -> ArtboardRenderer:
+        """Cria um renderizador; compartilha os bitmaps do outro se for do mesmo documento"""
+        bitmaps = None
+        if other is not None and other.base_directory == base_directory and other.resources is resources:
+            bitmaps = other.bitmaps
+        return ArtboardRenderer(base_directory, resources, bitmaps=bitmaps)
+    
+    @staticmethod
+    def _read_artboard(artboard_data: Union[Dict[str, Any], str],
+                       resources: Optional[IResourceSource]) -> Dict[str, Any]:
+        """Dados do artboard: o próprio dicionário ou o JSON lido do caminho"""
+        # Se artboard_data é um dicionário, usar diretamente
+        if isinstance(artboard_data, dict):
+            return artboard_data
+        # Se é string (caminho), tentar carregar do arquivo
+        with (resources.open(artboard_data) if resources else open(artboard_data, 'rb')) as f:
+            return json.load(f)
+    
+    @staticmethod
+    def _open_image(image_path: str, resources: Optional[IResourceSource]) -> Image.Image:
+        return Image.open(resources.open(image_path) if resources else image_path)
+    
+    def _artboard_identity(self, artboard_dict: Dict[str, Any], resources: Optional[IResourceSource],
+                           member: Optional[str] = None) -> Optional[str]:
+        """Identidade do artboard (documento e conteúdo do JSON), ou None sem fonte de recursos
+        
+        Com o arquivo de origem usa a chave do membro (ex.: CRC32 do .xd); sem ele o
+        JSON é serializado e resumido uma única vez por dicionário.
+        """
+        if resources is None:
+            return None
+        try:
+            if member is not None:
+                return artboard_content_key(resources, artboard_dict, member)
+            entry = self._identities.get(id(artboard_dict))
+            # A entrada mantém o dicionário vivo, então o id não é reutilizado enquanto estiver em cache
+            if entry is None or entry[0] is not artboard_dict or entry[1] is not resources:
+                entry = (artboard_dict, resources, artboard_content_key(resources, artboard_dict))
+                self._identities.put(id(artboard_dict), entry)
+            return entry[2]
+        except OSError:
+            return None
+    
+    @staticmethod
+    def _artboard_member(content: Union[str, Dict[str, Any]]) -> Optional[str]:
+        """Arquivo JSON de origem do artboard: o próprio caminho ou o path de um item artboard_json"""
+        if isinstance(content, str):
+            return content
+        if isinstance(content, dict) and content.get('type') == 'artboard_json':
+            return content.get('path') or None
+        return None
+    
+    @staticmethod
+    def _image_cache_key(image_path: str, resources: Optional[IResourceSource]) -> Optional[Tuple[str, str]]:
+        """Chave da imagem no cache em memória: identidade do arquivo de origem"""
+        try:
+            if resources is not None:
+                return 'image', resources.content_key(image_path)
+            stat = os.stat(image_path)
+            return 'image', f"{os.path.abspath(image_path)}:{stat.st_size}:{stat.st_mtime_ns}"
+        except OSError:
+            return None
+    
+    @staticmethod
+    def _resolve_content(content: Union[str, Dict[str, Any]],
+                         base_directory: Optional[str]) -> Tuple[str, Union[str, Dict[str, Any]], Optional[str]]:
+        """Classifica o conteúdo como ('artboard', dados, pasta base) ou ('image', caminho, None)"""
         if isinstance(content, dict):
             # É um artboard JSON
             if content.get('type') in ['artboard_json', 'artboard_manifest']:
-                artboard_data = content.get('data', content)
-                base_dir = base_directory or os.path.dirname(content.get('path', ''))
-                self.load_artboard(artboard_data, base_dir)
-            else:
-                raise ValueError("Formato de conteúdo desconhecido")
+                return 'artboard', content.get('data', content), base_directory or os.path.dirname(content.get('path', ''))
+            raise ValueError("Formato de conteúdo desconhecido")
         elif isinstance(content, str):
             # Verificar se é um arquivo JSON ou imagem
             if content.endswith('.json'):
                 # Tentar carregar como artboard
-                base_dir = base_directory or os.path.dirname(content)
-                self.load_artboard(content, base_dir)
-            else:
-                # Carregar como imagem
-                self.load_image(content)
+                return 'artboard', content, base_directory or os.path.dirname(content)
+            # Carregar como imagem
+            return 'image', content, None
+        raise ValueError("Tipo de conteúdo não suportado")
+    
+    def load_content(self, content: Union[str, Dict[str, Any]], base_directory: Optional[str] = None):
+        """Carrega conteúdo (imagem ou artboard) baseado no tipo"""
+        # Especulação pendente não deve disputar a CPU com o item pedido
+        self.prefetcher.cancel()
+        kind, data, base_dir = self._resolve_content(content, base_directory)
+        if kind == 'artboard':
+            self.load_artboard(data, base_dir, self._artboard_member(content))
+        else:
+            self.load_image(data)
+    
+    def prefetch_neighbours(self, contents: List[Any], index: int, base_directory: Optional[str] = None):
+        """Agenda a preparação dos vizinhos de contents[index] em segundo plano (próximo antes do anterior)
+        
+        Substitui o que estava agendado para a seleção anterior.
+        """
+        resources = self.resources
+        jobs = []
+        for distance in range(1, self.PREFETCH_DISTANCE + 1):
+            for neighbour in (index + distance, index - distance):
+                if 0 <= neighbour < len(contents):
+                    jobs.append(lambda content=contents[neighbour]: self._prefetch(content, base_directory, resources))
+        self.prefetcher.schedule(jobs)
+    
+    def _prefetch(self, content: Union[str, Dict[str, Any]], base_directory: Optional[str],
+                  resources: Optional[IResourceSource]):
+        """Executado na thread de fundo: prepara um item e o guarda no cache de pré-carregados"""
+        if resources is not self.resources:
+            return  # documento trocado
+        kind, data, base_dir = self._resolve_content(content, base_directory)
+        if kind == 'image':
+            key = self._image_cache_key(data, resources)
+            if key is None or key in self.render_cache or key in self.prefetch_cache:
+                return
+            image = self._open_image(data, resources)
+            image.load()
         else:
-            raise ValueError("Tipo de conteúdo não suportado")
+            artboard_dict = self._read_artboard(data, resources)
+            width = artboard_dict.get('width', artboard_dict.get('w', 800))
+            height = artboard_dict.get('height', artboard_dict.get('h', 600))
+            identity = self._artboard_identity(artboard_dict, resources, self._artboard_member(content))
+            key = ('artboard', identity, width, height)
+            if identity is None or key in self.render_cache or key in self.prefetch_cache:
+                return
+            # Não renderizar o que não caberia no orçamento
+            if width * height * 4 > self.prefetch_cache.max_bytes:
+                return
+            renderer = self._get_prefetch_renderer(base_dir, resources)
+            try:
+                image = self._produce_artboard_image(artboard_dict, width, height, renderer, identity, resources)
+            except RenderCancelled:
+                return  # a seleção mudou durante a renderização
+            if image is None:
+                return
+        self.prefetch_cache.put(key, image)
+    
+    def close(self):
+        """Encerra a preparação em segundo plano e conclui as gravações no cache em disco"""
+        self.prefetcher.shutdown()
+        if self.disk_cache is not None:
+            self.disk_cache.flush()
     
     def calculate_zoom(self, event, canvas_width: int, canvas_height: int) -> Tuple[Optional[float], Optional[Tuple[int, int]]]:
         """Calcula novo zoom e offset baseado no evento do mouse"""
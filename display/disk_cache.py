@@ -0,0 +1,203 @@
+"""Cache persistente de imagens geradas (SRP)"""
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Optional
+from PIL import Image
+from interfaces import IResourceSource
+
+
+def artboard_content_key(resources: IResourceSource, artboard_data: Dict[str, Any],
+                         member: Optional[str] = None) -> str:
+    """Identidade de um artboard: documento de origem e conteúdo do JSON do artboard
+    
+    Se member (o arquivo JSON de onde os dados foram lidos) for dado, usa a chave
+    do arquivo em vez de serializar os dados.
+    """
+    if member is not None:
+        return f"{resources.content_key(resources.root)}:{resources.content_key(member)}"
+    content = json.dumps(artboard_data, sort_keys=True, default=str)
+    return f"{resources.content_key(resources.root)}:{hashlib.sha1(content.encode('utf-8')).hexdigest()}"
+
+
+class DiskCache:
+    """Guarda miniaturas e rasters gerados entre execuções, com descarte LRU por tamanho (Single Responsibility)
+    
+    As chaves devem identificar o conteúdo de origem (ex.: CRC32 do membro do .xd)
+    e os parâmetros de geração, de modo que um arquivo alterado nunca reaproveite
+    uma entrada antiga. O horário de modificação de cada entrada é atualizado a
+    cada leitura e serve como ordem de uso no descarte. Falhas de E/S são
+    ignoradas: o cache nunca impede a exibição.
+    
+    put_image_async() grava em uma thread de fundo (codificação PNG e a
+    varredura inicial da pasta não ocupam quem chama).
+    """
+    
+    DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+    
+    def __init__(self, directory: Optional[str] = None, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.directory = directory or self.default_directory()
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._maintenance_lock = threading.Lock()
+        self._total_bytes: Optional[int] = None
+        self._writer: Optional[ThreadPoolExecutor] = None
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.evictions = 0
+    
+    @staticmethod
+    def default_directory() -> str:
+        """Pasta padrão do cache ($XDG_CACHE_HOME/xd_viewer ou ~/.cache/xd_viewer)"""
+        base = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+        return os.path.join(base, 'xd_viewer')
+    
+    @staticmethod
+    def key(*parts: Any) -> str:
+        """Monta uma chave a partir da identidade do conteúdo e dos parâmetros de geração"""
+        return hashlib.sha1('\0'.join(str(part) for part in parts).encode('utf-8')).hexdigest()
+    
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], key + '.png')
+    
+    def get_image(self, key: str) -> Optional[Image.Image]:
+        """Retorna a imagem em cache ou None"""
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as f:
+                image = Image.open(f)
+                image.load()
+            os.utime(path)
+        except FileNotFoundError:
+            with self._lock:
+                self.misses += 1
+            return None
+        except (OSError, SyntaxError, ValueError):
+            # Entrada corrompida ou ilegível: descartar
+            self._remove(path)
+            with self._lock:
+                self.misses += 1
+            return None
+        with self._lock:
+            self.hits += 1
+        return image
+    
+    def put_image(self, key: str, image: Image.Image):
+        """Armazena uma imagem (PNG com compressão leve) e descarta as entradas mais antigas se preciso"""
+        path = self._path(key)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+            try:
+                with os.fdopen(fd, 'wb') as f:
+                    image.save(f, 'PNG', compress_level=1)
+                previous = os.path.getsize(path) if os.path.exists(path) else 0
+                size = os.path.getsize(temp_path)
+                os.replace(temp_path, path)
+            except BaseException:
+                self._remove(temp_path)
+                raise
+        except (OSError, ValueError):
+            return
+        
+        with self._lock:
+            self.writes += 1
+            if self._total_bytes is not None:
+                self._total_bytes += size - previous
+            needs_maintenance = self._total_bytes is None or self._total_bytes > self.max_bytes
+        if needs_maintenance:
+            self._maintain()
+    
+    def put_image_async(self, key: str, image: Image.Image):
+        """Agenda put_image em uma thread de fundo; a imagem não deve ser alterada depois"""
+        with self._lock:
+            if self._writer is None:
+                self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="disk-cache")
+            writer = self._writer
+        writer.submit(self.put_image, key, image)
+    
+    def flush(self):
+        """Aguarda as gravações agendadas por put_image_async"""
+        with self._lock:
+            writer, self._writer = self._writer, None
+        if writer is not None:
+            writer.shutdown(wait=True)
+    
+    def clear(self):
+        """Remove todas as entradas"""
+        with self._maintenance_lock:
+            for path, _, _ in self._entries():
+                self._remove(path)
+            with self._lock:
+                self._total_bytes = 0
+    
+    def stats(self) -> Dict[str, Any]:
+        """Retorna estatísticas de uso do cache"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'directory': self.directory,
+                'bytes': self._total_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'writes': self.writes,
+                'evictions': self.evictions,
+                'hit_rate': self.hits / lookups if lookups else 0.0
+            }
+    
+    def _entries(self):
+        """Lista (caminho, tamanho, mtime) de todas as entradas"""
+        entries = []
+        if not os.path.isdir(self.directory):
+            return entries
+        for dirpath, _, filenames in os.walk(self.directory):
+            for filename in filenames:
+                if not filename.endswith('.png'):
+                    continue
+                path = os.path.join(dirpath, filename)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((path, stat.st_size, stat.st_mtime))
+        return entries
+    
+    def _maintain(self):
+        """Recalcula o tamanho da pasta e, se passar do limite, remove as entradas
+        menos usadas até ficar abaixo de 90% dele
+        
+        A varredura e as remoções rodam fora de _lock (get_image e os contadores
+        não esperam por elas); _lock só protege a atualização final do total.
+        Se outra manutenção já estiver em curso, esta é dispensada.
+        """
+        if not self._maintenance_lock.acquire(blocking=False):
+            return
+        try:
+            entries = self._entries()
+            total = sum(size for _, size, _ in entries)
+            evicted = 0
+            if total > self.max_bytes:
+                target = self.max_bytes * 0.9
+                for path, size, _ in sorted(entries, key=lambda entry: entry[2]):
+                    if total <= target:
+                        break
+                    if self._remove(path):
+                        total -= size
+                        evicted += 1
+            with self._lock:
+                self._total_bytes = total
+                self.evictions += evicted
+        finally:
+            self._maintenance_lock.release()
+    
+    @staticmethod
+    def _remove(path: str) -> bool:
+        try:
+            os.remove(path)
+            return True
+        except OSError:
+            return False
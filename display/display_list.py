@@ -0,0 +1,234 @@
+"""Compilação de artboards em listas de exibição (SRP)"""
+from enum import IntEnum
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from .spatial_index import Bounds, GridIndex
+
+Color = Tuple[int, int, int, int]
+
+
+class ElementKind(IntEnum):
+    """Primitivas desenháveis (GROUP só existe durante a compilação)"""
+    RECTANGLE = 0
+    CIRCLE = 1
+    LINE = 2
+    TEXT = 3
+    IMAGE = 4
+    GROUP = 5
+
+
+def element_kind(element: Dict[str, Any]) -> Optional[ElementKind]:
+    """Classifica o elemento pelo tipo (a ordem dos testes define a precedência)"""
+    element_type = str(element.get('type', '')).lower()
+    if 'rectangle' in element_type or 'rect' in element_type:
+        return ElementKind.RECTANGLE
+    if 'circle' in element_type or 'ellipse' in element_type:
+        return ElementKind.CIRCLE
+    if 'line' in element_type or 'path' in element_type:
+        return ElementKind.LINE
+    if 'text' in element_type or 'string' in element_type:
+        return ElementKind.TEXT
+    if 'image' in element_type or 'bitmap' in element_type or 'picture' in element_type:
+        return ElementKind.IMAGE
+    if 'group' in element_type or 'container' in element_type:
+        return ElementKind.GROUP
+    return None
+
+
+def parse_color(color_value: Any) -> Optional[Color]:
+    """Converte valor de cor para RGBA tuple"""
+    if color_value is None:
+        return None
+    
+    if isinstance(color_value, str):
+        # Hex color (#RRGGBB ou #RRGGBBAA)
+        if color_value.startswith('#'):
+            hex_color = color_value[1:]
+            if len(hex_color) == 6:
+                return (int(hex_color[0:2], 16), int(hex_color[2:4], 16), int(hex_color[4:6], 16), 255)
+            elif len(hex_color) == 8:
+                return (int(hex_color[0:2], 16), int(hex_color[2:4], 16), int(hex_color[4:6], 16), int(hex_color[6:8], 16))
+        # RGB/RGBA string
+        elif color_value.startswith('rgb'):
+            # Simplificado - retornar preto
+            return (0, 0, 0, 255)
+    
+    elif isinstance(color_value, dict):
+        # Objeto de cor {r, g, b, a}
+        r = int(color_value.get('r', color_value.get('red', 0)) * 255) if isinstance(color_value.get('r', 0), float) else color_value.get('r', 0)
+        g = int(color_value.get('g', color_value.get('green', 0)) * 255) if isinstance(color_value.get('g', 0), float) else color_value.get('g', 0)
+        b = int(color_value.get('b', color_value.get('blue', 0)) * 255) if isinstance(color_value.get('b', 0), float) else color_value.get('b', 0)
+        a = int(color_value.get('a', color_value.get('alpha', 1.0)) * 255) if isinstance(color_value.get('a', 1.0), float) else color_value.get('a', 255)
+        return (r, g, b, a)
+    
+    elif isinstance(color_value, (list, tuple)):
+        # Lista/tupla [r, g, b] ou [r, g, b, a]
+        if len(color_value) >= 3:
+            r = int(color_value[0] * 255) if isinstance(color_value[0], float) else color_value[0]
+            g = int(color_value[1] * 255) if isinstance(color_value[1], float) else color_value[1]
+            b = int(color_value[2] * 255) if isinstance(color_value[2], float) else color_value[2]
+            a = int(color_value[3] * 255) if len(color_value) > 3 and isinstance(color_value[3], float) else (color_value[3] if len(color_value) > 3 else 255)
+            return (r, g, b, a)
+    
+    # Fallback: preto
+    return (0, 0, 0, 255)
+
+
+def apply_opacity(color: Optional[Color], opacity: float) -> Optional[Color]:
+    """Aplica opacidade a uma cor"""
+    if color is None:
+        return None
+    if len(color) == 4:
+        return (color[0], color[1], color[2], int(color[3] * opacity))
+    return color + (int(255 * opacity),)
+
+
+class DisplayItem:
+    """Primitiva compilada, em coordenadas absolutas do artboard
+    
+    Campos não usados pelo tipo ficam None: cores já com opacidade aplicada,
+    points (caminho, relativo a x/y) e end_x/end_y (x2/y2 absolutos) para
+    linhas, lines/font_size para texto e path para bitmaps.
+    """
+    
+    __slots__ = ('kind', 'x', 'y', 'width', 'height', 'opacity', 'fill', 'stroke', 'stroke_width',
+                 'points', 'end_x', 'end_y', 'lines', 'font_size', 'path')
+    
+    def __init__(self, kind: ElementKind, x: float, y: float, width: float, height: float, opacity: float):
+        self.kind = kind
+        self.x = x
+        self.y = y
+        self.width = width
+        self.height = height
+        self.opacity = opacity
+        self.fill: Optional[Color] = None
+        self.stroke: Optional[Color] = None
+        self.stroke_width = 0
+        self.points: Optional[List[Tuple[float, float]]] = None
+        self.end_x: Optional[float] = None
+        self.end_y: Optional[float] = None
+        self.lines: Optional[List[str]] = None
+        self.font_size = 0
+        self.path: Optional[str] = None
+    
+    def bounds(self) -> Optional[Bounds]:
+        """Retângulo que contém tudo o que o item desenha, ou None se desconhecido sem desenhar"""
+        x, y, width, height = self.x, self.y, self.width, self.height
+        if self.kind == ElementKind.LINE:
+            if self.points is not None:
+                points = [(x + u, y + v) for u, v in self.points]
+            else:
+                points = [(x, y), (x + width if self.end_x is None else self.end_x,
+                                   y + height if self.end_y is None else self.end_y)]
+            margin = abs(self.stroke_width)
+            xs, ys = [p[0] for p in points], [p[1] for p in points]
+            return min(xs) - margin, min(ys) - margin, max(xs) + margin, max(ys) + margin
+        if self.kind == ElementKind.TEXT:
+            # Estimativa folgada: até 1.5 em por caractere e 1.2 em por linha
+            size = self.font_size
+            text_width = max(len(line) for line in self.lines) * size * 1.5
+            text_height = len(self.lines) * size * 1.2
+            return x - size, y - size, x + max(width, text_width) + size, y + max(height, text_height) + size
+        if self.kind == ElementKind.IMAGE and not (width > 0 and height > 0):
+            return None
+        return min(x, x + width), min(y, y + height), max(x, x + width), max(y, y + height)
+
+
+class DisplayList:
+    """Artboard compilado: fundo, primitivas na ordem de desenho e seu índice espacial"""
+    
+    __slots__ = ('background', 'items', 'index')
+    
+    def __init__(self, background: Optional[Color], items: List[DisplayItem]):
+        self.background = background
+        self.items = items
+        bounds = []
+        for item in items:
+            try:
+                bounds.append(item.bounds())
+            except Exception:
+                bounds.append(None)
+        self.index = GridIndex(bounds)
+
+
+class DisplayListCompiler:
+    """Achata a árvore JSON de um artboard em uma DisplayList (Single Responsibility)
+    
+    Os atributos de cada elemento são resolvidos uma única vez: deslocamento dos
+    grupos aplicado a x/y, cores convertidas para RGBA e caminhos de bitmaps
+    localizados por resolve_image (None quando o arquivo não existe). Elementos
+    que não desenham nada são descartados.
+    """
+    
+    def __init__(self, resolve_image: Callable[[str], Optional[str]]):
+        self.resolve_image = resolve_image
+    
+    def compile(self, artboard_data: Dict[str, Any]) -> DisplayList:
+        background = parse_color(artboard_data.get('backgroundColor', artboard_data.get('bgColor', '#FFFFFF')))
+        items: List[DisplayItem] = []
+        children = artboard_data.get('children', artboard_data.get('elements', artboard_data.get('content', [])))
+        if isinstance(children, list):
+            self._compile_children(children, 0, 0, items)
+        return DisplayList(background, items)
+    
+    def _compile_children(self, children: List[Any], offset_x: float, offset_y: float, items: List[DisplayItem]):
+        for child in children:
+            if not isinstance(child, dict):
+                continue
+            kind = element_kind(child)
+            if kind is None:
+                continue
+            # Posição relativa ao grupo
+            x = child.get('x', child.get('left', 0)) + offset_x
+            y = child.get('y', child.get('top', 0)) + offset_y
+            if kind == ElementKind.GROUP:
+                grandchildren = child.get('children', child.get('elements', child.get('content', [])))
+                if isinstance(grandchildren, list):
+                    self._compile_children(grandchildren, x, y, items)
+                continue
+            
+            item = DisplayItem(kind, x, y, child.get('width', child.get('w', 0)), child.get('height', child.get('h', 0)),
+                               child.get('opacity', child.get('alpha', 1.0)))
+            if self._compile_item(item, child):
+                items.append(item)
+    
+    def _compile_item(self, item: DisplayItem, element: Dict[str, Any]) -> bool:
+        """Preenche os campos do tipo; retorna False se o elemento não desenha nada"""
+        kind, opacity = item.kind, item.opacity
+        if kind == ElementKind.RECTANGLE or kind == ElementKind.CIRCLE:
+            item.fill = apply_opacity(parse_color(element.get('fill', element.get('color', '#000000'))), opacity)
+            stroke_width = element.get('strokeWidth', element.get('borderWidth', 0))
+            stroke = parse_color(element.get('stroke', element.get('borderColor')))
+            if stroke and stroke_width > 0:
+                item.stroke, item.stroke_width = apply_opacity(stroke, opacity), stroke_width
+            return item.fill is not None or item.stroke is not None
+        
+        if kind == ElementKind.LINE:
+            item.stroke = apply_opacity(parse_color(element.get('stroke', element.get('color', '#000000'))), opacity)
+            item.stroke_width = element.get('strokeWidth', element.get('width', 1))
+            path = element.get('path', element.get('d', []))
+            if path and isinstance(path, list) and len(path) >= 2:
+                item.points = [(p.get('x', 0), p.get('y', 0)) if isinstance(p, dict) else
+                               (p[0], p[1]) if isinstance(p, (list, tuple)) else (0, 0) for p in path]
+            else:
+                # x2/y2 estão em coordenadas do artboard (não são deslocados pelos grupos)
+                if 'x2' in element:
+                    item.end_x = element['x2']
+                if 'y2' in element:
+                    item.end_y = element['y2']
+            return item.stroke is not None
+        
+        if kind == ElementKind.TEXT:
+            text = element.get('text', element.get('content', element.get('string', '')))
+            item.fill = apply_opacity(parse_color(element.get('fill', element.get('color', '#000000'))), opacity)
+            if not text or item.fill is None:
+                return False
+            item.lines = str(text).split('\n')
+            item.font_size = element.get('fontSize', element.get('size', 12))
+            return True
+        
+        if kind == ElementKind.IMAGE:
+            image_path = element.get('href', element.get('src', element.get('path', element.get('file', ''))))
+            item.path = self.resolve_image(image_path) if image_path else None
+            return item.path is not None
+        
+        return False
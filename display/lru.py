@@ -0,0 +1,101 @@
+"""Cache LRU com limite de itens e/ou bytes (SRP)"""
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional
+
+
+def image_nbytes(image: Any) -> int:
+    """Estima o tamanho em memória de uma imagem PIL"""
+    try:
+        width, height = image.size
+        return width * height * len(image.getbands())
+    except AttributeError:
+        return 0
+
+
+class LRUCache:
+    """Cache LRU limitado por quantidade de itens e/ou orçamento de bytes (Single Responsibility)"""
+    
+    def __init__(self, max_items: Optional[int] = None, max_bytes: Optional[int] = None,
+                 sizeof: Callable[[Any], int] = image_nbytes):
+        self.max_items = max_items
+        self.max_bytes = max_bytes
+        self.sizeof = sizeof
+        self._entries: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._sizes: Dict[Hashable, int] = {}
+        self._lock = threading.RLock()
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._entries
+    
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Retorna valor em cache, marcando-o como usado recentemente"""
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+            self.misses += 1
+            return default
+    
+    def put(self, key: Hashable, value: Any):
+        """Armazena valor e descarta os menos usados se exceder os limites"""
+        size = self.sizeof(value)
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            if self.max_bytes is not None and size > self.max_bytes:
+                return
+            self._entries[key] = value
+            self._sizes[key] = size
+            self.current_bytes += size
+            self._evict()
+    
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        """Remove e retorna um valor do cache"""
+        with self._lock:
+            if key not in self._entries:
+                return default
+            value = self._entries[key]
+            self._remove(key)
+            return value
+    
+    def clear(self):
+        """Remove todos os itens (mantém estatísticas)"""
+        with self._lock:
+            self._entries.clear()
+            self._sizes.clear()
+            self.current_bytes = 0
+    
+    def stats(self) -> Dict[str, Any]:
+        """Retorna estatísticas de uso do cache"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'items': len(self._entries),
+                'bytes': self.current_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': self.hits / lookups if lookups else 0.0
+            }
+    
+    def _remove(self, key: Hashable):
+        del self._entries[key]
+        self.current_bytes -= self._sizes.pop(key, 0)
+    
+    def _evict(self):
+        while self._entries and (
+            (self.max_items is not None and len(self._entries) > self.max_items) or
+            (self.max_bytes is not None and self.current_bytes > self.max_bytes)
+        ):
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self.evictions += 1
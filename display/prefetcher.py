@@ -0,0 +1,97 @@
+"""Execução especulativa em segundo plano (SRP)"""
+import threading
+from collections import deque
+from typing import Callable, Deque, Dict, Iterable, Optional
+
+
+class Prefetcher:
+    """Executa tarefas especulativas em uma thread de fundo, na ordem dada (Single Responsibility)
+    
+    schedule() substitui todas as tarefas pendentes (ex.: a seleção saltou para
+    outro item): a tarefa em andamento termina, mas as antigas não começam.
+    Erros das tarefas são apenas contabilizados; especulação nunca interrompe
+    a exibição. Tarefas longas podem consultar superseded() para abandonar o
+    trabalho assim que ele deixar de ser útil.
+    """
+    
+    def __init__(self, name: str = "prefetch"):
+        self.name = name
+        self._jobs: Deque[Callable[[], None]] = deque()
+        self._condition = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._running = False
+        self._closed = False
+        # Incrementada a cada schedule()/shutdown(); a tarefa em execução guarda a sua
+        self._generation = 0
+        self._job_generation = 0
+        self.completed = 0
+        self.failed = 0
+        self.cancelled = 0
+    
+    @property
+    def busy(self) -> bool:
+        """Indica se há tarefas pendentes ou em execução"""
+        with self._condition:
+            return bool(self._jobs) or self._running
+    
+    def schedule(self, jobs: Iterable[Callable[[], None]]):
+        """Substitui as tarefas pendentes pelas novas, em ordem de prioridade"""
+        with self._condition:
+            if self._closed:
+                return
+            self.cancelled += len(self._jobs)
+            self._generation += 1
+            self._jobs = deque(jobs)
+            if self._jobs and self._thread is None:
+                self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+                self._thread.start()
+            self._condition.notify()
+    
+    def cancel(self):
+        """Descarta as tarefas pendentes"""
+        self.schedule(())
+    
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Aguarda até não haver tarefas pendentes nem em execução; retorna False se expirou"""
+        with self._condition:
+            return self._condition.wait_for(lambda: not self._jobs and not self._running, timeout)
+    
+    def shutdown(self):
+        """Descarta as tarefas pendentes e encerra a thread após a tarefa em andamento"""
+        with self._condition:
+            self.cancelled += len(self._jobs)
+            self._jobs.clear()
+            self._generation += 1
+            self._closed = True
+            self._condition.notify_all()
+    
+    def superseded(self) -> bool:
+        """Indica se as tarefas foram substituídas ou canceladas depois que a tarefa em execução começou"""
+        with self._condition:
+            return self._generation != self._job_generation
+    
+    def stats(self) -> Dict[str, int]:
+        with self._condition:
+            return {'pending': len(self._jobs), 'completed': self.completed,
+                    'failed': self.failed, 'cancelled': self.cancelled}
+    
+    def _run(self):
+        """Executado na thread de fundo"""
+        while True:
+            with self._condition:
+                self._running = False
+                self._condition.notify_all()
+                self._condition.wait_for(lambda: self._jobs or self._closed)
+                if self._closed:
+                    return
+                job = self._jobs.popleft()
+                self._job_generation = self._generation
+                self._running = True
+            try:
+                job()
+            except Exception:
+                with self._condition:
+                    self.failed += 1
+            else:
+                with self._condition:
+                    self.completed += 1
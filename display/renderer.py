@@ -1,71 +1,273 @@
 """Renderizador (SRP + ISP)"""
 import tkinter as tk
 import os
-from typing import Optional, Union, Dict, Any
+from typing import Optional, Union, Dict, Any, Tuple
 from PIL import Image, ImageTk
 from interfaces import IDisplayRenderer
 from .state import DisplayState
 from .controller import ImageDisplayController
+from .lru import LRUCache
 
 
 class CanvasRenderer(IDisplayRenderer):
     """Renderiza conteúdo em Canvas tkinter (Single Responsibility)"""
     
-    def __init__(self, canvas: tk.Canvas, display_state: DisplayState, controller: ImageDisplayController):
+    TILE_SIZE = 256
+    TILE_MARGIN = 128
+    TILE_CACHE_BYTES = 96 * 1024 * 1024
+    
+    def __init__(self, canvas: tk.Canvas, display_state: DisplayState, controller: ImageDisplayController,
+                 tiled: bool = True, progressive: bool = True,
+                 preview_resample: int = Image.Resampling.BILINEAR,
+                 final_resample: int = Image.Resampling.LANCZOS,
+                 refine_delay_ms: int = 150):
         self.canvas = canvas
         self.display_state = display_state
         self.controller = controller
         self.display_image: Optional[Image.Image] = None
         self.photo: Optional[ImageTk.PhotoImage] = None
         self.base_directory: Optional[str] = None
+        # Modo em blocos: reamostra apenas a região visível do canvas
+        self.tiled = tiled
+        self.tile_cache = LRUCache(max_bytes=self.TILE_CACHE_BYTES)
+        # Item do canvas e região (em coordenadas da imagem escalada) já desenhada
+        self._image_item: Optional[int] = None
+        self._rendered_scale: Optional[float] = None
+        self._rendered_region: Optional[Tuple[int, int, int, int]] = None
+        # Renderização progressiva: prévia rápida durante a interação, refinamento após ociosidade
+        # (progressive=False mantém sempre o filtro final, ex.: LANCZOS)
+        self.progressive = progressive
+        self.preview_resample = preview_resample
+        self.final_resample = final_resample
+        self.refine_delay_ms = refine_delay_ms
+        self._rendered_resample: Optional[int] = None
+        self._refine_job: Optional[str] = None
     
     def load_content(self, content: Union[str, Dict[str, Any]], base_directory: Optional[str] = None):
         """Carrega conteúdo para visualização (imagem ou artboard)"""
         self.base_directory = base_directory
+        self._cancel_refine()
         self.controller.load_content(content, base_directory)
+        self.tile_cache.clear()
+        self._rendered_region = None
         self.render()
     
-    def render(self):
-        """Renderiza o conteúdo carregado no canvas"""
+    def render(self, interactive: bool = False):
+        """Renderiza o conteúdo carregado no canvas (prévia rápida se interactive=True)"""
         if self.controller.original_image is None:
             return
         
+        resample = self.final_resample
+        if interactive and self.progressive:
+            resample = self.preview_resample
+        
+        if self.tiled:
+            self._render_tiled(resample)
+        else:
+            self._render_full(resample)
+        self._rendered_resample = resample
+        
+        if resample != self.final_resample:
+            self._schedule_refine()
+    
+    def _schedule_refine(self):
+        """Agenda o passe de alta qualidade para quando a entrada ficar ociosa"""
+        self._cancel_refine()
+        self._refine_job = self.canvas.after(self.refine_delay_ms, self._refine)
+    
+    def _cancel_refine(self):
+        """Cancela um refinamento pendente"""
+        if self._refine_job is not None:
+            self.canvas.after_cancel(self._refine_job)
+            self._refine_job = None
+    
+    def _refine(self):
+        """Substitui a prévia pela renderização com o filtro final"""
+        self._refine_job = None
+        if self._rendered_resample != self.final_resample:
+            self.render()
+    
+    def _render_full(self, resample: int):
+        """Redimensiona a imagem inteira para a escala atual"""
         width, height = self.controller.original_image.size
         new_width = int(width * self.display_state.scale)
         new_height = int(height * self.display_state.scale)
         
-        self.display_image = self.controller.original_image.resize(
+        self.display_image = self.controller.resample_region(
             (new_width, new_height),
-            Image.Resampling.LANCZOS
+            (0, 0, new_width, new_height),
+            resample,
+            rasterize=resample == self.final_resample
         )
         
-        self.photo = ImageTk.PhotoImage(self.display_image)
-        self.canvas.delete("all")
+        x, y = self._image_origin(new_width, new_height)
+        self._show(self.display_image, x, y, (0, 0, new_width, new_height))
+    
+    def _render_tiled(self, resample: int):
+        """Reamostra e compõe apenas os blocos sob a área visível do canvas"""
+        width, height = self.controller.original_image.size
+        scale = self.display_state.scale
+        new_width = int(width * scale)
+        new_height = int(height * scale)
+        x, y = self._image_origin(new_width, new_height)
         
         canvas_width = max(self.canvas.winfo_width(), 1)
         canvas_height = max(self.canvas.winfo_height(), 1)
         
-        x = (canvas_width - new_width) // 2 + self.display_state.offset_x
-        y = (canvas_height - new_height) // 2 + self.display_state.offset_y
+        # Região visível (mais margem) em coordenadas da imagem escalada
+        left = max(0, -x - self.TILE_MARGIN)
+        top = max(0, -y - self.TILE_MARGIN)
+        right = min(new_width, canvas_width - x + self.TILE_MARGIN)
+        bottom = min(new_height, canvas_height - y + self.TILE_MARGIN)
+        
+        if right <= left or bottom <= top:
+            self.display_image = None
+            self.photo = None
+            self.canvas.delete("all")
+            self._image_item = None
+            self._rendered_region = None
+            return
+        
+        tile = self.TILE_SIZE
+        first_col, last_col = left // tile, (right - 1) // tile
+        first_row, last_row = top // tile, (bottom - 1) // tile
+        
+        region_left = first_col * tile
+        region_top = first_row * tile
+        region_width = min((last_col + 1) * tile, new_width) - region_left
+        region_height = min((last_row + 1) * tile, new_height) - region_top
+        
+        mode = self._composite_mode(self.controller.original_image.mode)
+        composite = Image.new(mode, (region_width, region_height))
+        for row in range(first_row, last_row + 1):
+            for col in range(first_col, last_col + 1):
+                tile_image = self._get_tile(scale, col, row, new_width, new_height, resample)
+                if tile_image.mode != mode:
+                    tile_image = tile_image.convert(mode)
+                composite.paste(tile_image, (col * tile - region_left, row * tile - region_top))
+        
+        self.display_image = composite
+        self._show(composite, x, y, (region_left, region_top,
+                                     region_left + region_width, region_top + region_height))
+    
+    def _get_tile(self, scale: float, col: int, row: int, scaled_width: int, scaled_height: int,
+                  resample: int) -> Image.Image:
+        """Retorna um bloco reamostrado, usando o cache por (escala, coluna, linha, filtro)"""
+        key = (round(scale, 6), col, row, resample)
+        tile_image = self.tile_cache.get(key)
+        if tile_image is not None:
+            return tile_image
         
-        self.canvas.create_image(x, y, anchor=tk.NW, image=self.photo)
+        box = self._tile_box(col, row, scaled_width, scaled_height)
+        # Prévias usam a imagem em cache; o passe final pode re-rasterizar artboards ampliados
+        tile_image = self.controller.resample_region((scaled_width, scaled_height), box, resample,
+                                                     rasterize=resample == self.final_resample)
+        self.tile_cache.put(key, tile_image)
+        return tile_image
+    
+    def _tile_box(self, col: int, row: int, scaled_width: int, scaled_height: int) -> Tuple[int, int, int, int]:
+        """Calcula a caixa de um bloco em coordenadas da imagem escalada"""
+        tile = self.TILE_SIZE
+        return (
+            col * tile,
+            row * tile,
+            min((col + 1) * tile, scaled_width),
+            min((row + 1) * tile, scaled_height)
+        )
+    
+    @staticmethod
+    def _composite_mode(mode: str) -> str:
+        """Modo de imagem usado para compor os blocos"""
+        if mode in ('RGB', 'RGBA', 'L', 'LA'):
+            return mode
+        return 'RGBA'
+    
+    def _image_origin(self, scaled_width: int, scaled_height: int) -> Tuple[int, int]:
+        """Posição do canto superior esquerdo da imagem escalada no canvas"""
+        canvas_width = max(self.canvas.winfo_width(), 1)
+        canvas_height = max(self.canvas.winfo_height(), 1)
+        
+        x = (canvas_width - scaled_width) // 2 + self.display_state.offset_x
+        y = (canvas_height - scaled_height) // 2 + self.display_state.offset_y
+        return x, y
+    
+    def _show(self, image: Image.Image, x: int, y: int, region: Tuple[int, int, int, int]):
+        """Exibe a imagem composta no canvas, reaproveitando o item existente"""
+        self.photo = ImageTk.PhotoImage(image)
+        if self._image_item is None:
+            self.canvas.delete("all")
+            self._image_item = self.canvas.create_image(x + region[0], y + region[1], anchor=tk.NW, image=self.photo)
+        else:
+            self.canvas.itemconfig(self._image_item, image=self.photo)
+            self.canvas.coords(self._image_item, x + region[0], y + region[1])
+        self._rendered_scale = self.display_state.scale
+        self._rendered_region = region
         self.canvas.config(scrollregion=self.canvas.bbox(tk.ALL))
     
+    def _place_item(self):
+        """Reposiciona o item do canvas conforme o deslocamento atual, sem reamostrar"""
+        width, height = self.controller.original_image.size
+        x, y = self._image_origin(int(width * self.display_state.scale), int(height * self.display_state.scale))
+        self.canvas.coords(self._image_item, x + self._rendered_region[0], y + self._rendered_region[1])
+    
+    def _covers_viewport(self) -> bool:
+        """Verifica se a região já desenhada cobre toda a área visível na escala atual"""
+        if self._image_item is None or self._rendered_region is None:
+            return False
+        if self._rendered_scale != self.display_state.scale:
+            return False
+        
+        width, height = self.controller.original_image.size
+        new_width = int(width * self.display_state.scale)
+        new_height = int(height * self.display_state.scale)
+        x, y = self._image_origin(new_width, new_height)
+        canvas_width = max(self.canvas.winfo_width(), 1)
+        canvas_height = max(self.canvas.winfo_height(), 1)
+        
+        left = max(0, -x)
+        top = max(0, -y)
+        right = min(new_width, canvas_width - x)
+        bottom = min(new_height, canvas_height - y)
+        if right <= left or bottom <= top:
+            # Nada visível: basta mover a região desenhada para fora da tela
+            return True
+        
+        region_left, region_top, region_right, region_bottom = self._rendered_region
+        return (region_left <= left and region_top <= top and
+                region_right >= right and region_bottom >= bottom)
+    
     def zoom(self, event, factor: float):
         """Aplica zoom no conteúdo"""
+        if self.update_zoom(event):
+            self.render(interactive=True)
+    
+    def update_zoom(self, event) -> bool:
+        """Atualiza escala e deslocamento para o evento de zoom, sem renderizar"""
         canvas_width = max(self.canvas.winfo_width(), 1)
         canvas_height = max(self.canvas.winfo_height(), 1)
         
         result = self.controller.calculate_zoom(event, canvas_width, canvas_height)
-        if result[0] is not None:
-            new_scale, (offset_x, offset_y) = result
-            self.display_state.scale = new_scale
-            self.display_state.offset_x = offset_x
-            self.display_state.offset_y = offset_y
-            self.render()
+        if result[0] is None:
+            return False
+        new_scale, (offset_x, offset_y) = result
+        self.display_state.scale = new_scale
+        self.display_state.offset_x = offset_x
+        self.display_state.offset_y = offset_y
+        return True
     
     def pan(self, delta_x: int, delta_y: int):
         """Move o conteúdo"""
         self.display_state.apply_pan(delta_x, delta_y)
-        self.render()
-
+        self.reposition()
+    
+    def reposition(self):
+        """Aplica o deslocamento atual movendo o item do canvas, reamostrando só se surgir área sem conteúdo"""
+        if self.controller.original_image is None:
+            return
+        if self._covers_viewport():
+            self._place_item()
+            if self._refine_job is not None:
+                # Entrada ainda ativa: adia o refinamento pendente
+                self._schedule_refine()
+        else:
+            self.render(interactive=True)
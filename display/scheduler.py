@@ -0,0 +1,94 @@
+"""Agendador de renderização (SRP)"""
+import time
+from typing import Optional, Dict, Any
+from .renderer import CanvasRenderer
+
+
+class RenderScheduler:
+    """Agrupa eventos de zoom, arraste e redimensionamento em no máximo uma renderização por quadro (Single Responsibility)"""
+    
+    def __init__(self, widget, renderer: CanvasRenderer, frame_ms: int = 16):
+        self.widget = widget
+        self.renderer = renderer
+        self.frame_ms = frame_ms
+        self._job: Optional[str] = None
+        self._last_flush = 0.0
+        # Pendências acumuladas até o próximo quadro
+        self._pending_render = False
+        self._pending_zoom = False
+        self._pending_pan = False
+        # Estatísticas
+        self.events = 0
+        self.renders = 0
+        # Eventos sem efeito (ex.: zoom ou arraste sem imagem carregada), fora da conta de descartados
+        self.ignored = 0
+    
+    def request_zoom(self, event):
+        """Aplica o zoom ao estado imediatamente e agenda a renderização"""
+        if not self.renderer.update_zoom(event):
+            self.ignored += 1
+            return
+        self.events += 1
+        self._pending_zoom = True
+        self._schedule()
+    
+    def request_pan(self, delta_x: int, delta_y: int):
+        """Acumula o deslocamento no estado e agenda o reposicionamento"""
+        if self.renderer.controller.original_image is None:
+            # Sem imagem, reposition() não teria o que mover
+            self.ignored += 1
+            return
+        self.events += 1
+        self.renderer.display_state.apply_pan(delta_x, delta_y)
+        self._pending_pan = True
+        self._schedule()
+    
+    def request_render(self):
+        """Agenda uma renderização completa (ex.: canvas redimensionado)"""
+        self.events += 1
+        self._pending_render = True
+        self._schedule()
+    
+    def cancel(self):
+        """Descarta pendências (ex.: ao trocar de conteúdo)"""
+        if self._job is not None:
+            self.widget.after_cancel(self._job)
+            self._job = None
+        self._pending_render = self._pending_zoom = self._pending_pan = False
+    
+    def stats(self) -> Dict[str, Any]:
+        """Retorna contagem de eventos recebidos, renderizações feitas, eventos descartados e ignorados"""
+        return {
+            'events': self.events,
+            'renders': self.renders,
+            'dropped': self.events - self.renders - (1 if self._job is not None else 0),
+            'ignored': self.ignored
+        }
+    
+    def _schedule(self):
+        """Agenda o processamento para o próximo quadro, se ainda não houver um agendado"""
+        if self._job is not None:
+            return
+        
+        elapsed_ms = (time.monotonic() - self._last_flush) * 1000
+        if elapsed_ms >= self.frame_ms:
+            self._job = self.widget.after_idle(self._flush)
+        else:
+            self._job = self.widget.after(int(self.frame_ms - elapsed_ms) + 1, self._flush)
+    
+    def _flush(self):
+        """Executa uma única renderização para todas as pendências acumuladas"""
+        self._job = None
+        self._last_flush = time.monotonic()
+        render, zoom, pan = self._pending_render, self._pending_zoom, self._pending_pan
+        self._pending_render = self._pending_zoom = self._pending_pan = False
+        
+        if render:
+            self.renderer.render()
+        elif zoom:
+            self.renderer.render(interactive=True)
+        elif pan:
+            self.renderer.reposition()
+        else:
+            return
+        self.renders += 1
@@ -0,0 +1,81 @@
+"""Índice espacial para recorte de elementos por região (SRP)"""
+import math
+from typing import Dict, List, Optional, Sequence, Tuple
+
+Bounds = Tuple[float, float, float, float]
+
+
+class GridIndex:
+    """Indexa retângulos (x0, y0, x1, y1) em uma grade uniforme (Single Responsibility)
+    
+    query() retorna, na ordem original, os índices dos retângulos que tocam uma
+    região, com custo proporcional às células cobertas e aos elementos nelas.
+    Retângulos None (extensão desconhecida) e os que cobririam células demais
+    (ex.: fundos) são sempre retornados.
+    """
+    
+    MAX_CELLS_PER_ITEM = 256
+    MIN_CELL_SIZE = 32.0
+    
+    def __init__(self, bounds: Sequence[Optional[Bounds]], cell_size: Optional[float] = None):
+        self.bounds = list(bounds)
+        self._always: List[int] = []
+        self._cells: Dict[Tuple[int, int], List[int]] = {}
+        
+        known = [b for b in self.bounds if b is not None]
+        if known:
+            self.extent = (min(b[0] for b in known), min(b[1] for b in known),
+                           max(b[2] for b in known), max(b[3] for b in known))
+        else:
+            self.extent = (0.0, 0.0, 0.0, 0.0)
+        self.cell_size = cell_size or self._default_cell_size(len(known))
+        
+        for i, b in enumerate(self.bounds):
+            if b is None:
+                self._always.append(i)
+                continue
+            cols, rows = self._span(b)
+            if len(cols) * len(rows) > self.MAX_CELLS_PER_ITEM:
+                self._always.append(i)
+                continue
+            for row in rows:
+                for col in cols:
+                    self._cells.setdefault((col, row), []).append(i)
+    
+    def __len__(self) -> int:
+        return len(self.bounds)
+    
+    def _default_cell_size(self, count: int) -> float:
+        """Células com ~4 elementos em média, supondo distribuição uniforme na extensão"""
+        width, height = self.extent[2] - self.extent[0], self.extent[3] - self.extent[1]
+        if count == 0 or width * height <= 0:
+            return self.MIN_CELL_SIZE
+        return max(self.MIN_CELL_SIZE, math.sqrt(width * height * 4 / count))
+    
+    def _span(self, b: Bounds) -> Tuple[range, range]:
+        size = self.cell_size
+        return (range(math.floor(b[0] / size), math.floor(b[2] / size) + 1),
+                range(math.floor(b[1] / size), math.floor(b[3] / size) + 1))
+    
+    def query(self, region: Bounds) -> List[int]:
+        """Índices (em ordem crescente) dos retângulos que intersectam region"""
+        extent = self.extent
+        if region[0] <= extent[0] and region[1] <= extent[1] and region[2] >= extent[2] and region[3] >= extent[3]:
+            return list(range(len(self.bounds)))
+        
+        cols, rows = self._span(region)
+        found = set(self._always)
+        if len(cols) * len(rows) > len(self._cells):
+            # Região maior que a parte ocupada da grade: percorrer as células existentes
+            candidates = (i for (col, row), items in self._cells.items()
+                          if col in cols and row in rows for i in items)
+        else:
+            candidates = (i for row in rows for col in cols for i in self._cells.get((col, row), ()))
+        bounds = self.bounds
+        for i in candidates:
+            if i in found:
+                continue
+            b = bounds[i]
+            if b[0] <= region[2] and b[2] >= region[0] and b[1] <= region[3] and b[3] >= region[1]:
+                found.add(i)
+        return sorted(found)
@@ -1,4 +1,5 @@
 """Estado de exibição (SRP)"""
+import math
 
 
 class DisplayState:
@@ -10,6 +11,9 @@ class DisplayState:
         self.offset_y = 0
         self.min_scale = 0.1
         self.max_scale = 10.0
+        # Ajusta o zoom para níveis da pirâmide (1, 1/2, 1/4...) quando estiver próximo deles
+        self.snap_to_levels = True
+        self.snap_tolerance = 0.05
     
     def reset(self):
         """Reseta estado para valores padrão"""
@@ -21,9 +25,20 @@ class DisplayState:
         """Aplica fator de zoom respeitando limites"""
         zoom_factor = 1.1 if factor > 0 else 0.9
         new_scale = self.scale * zoom_factor
+        if self.snap_to_levels:
+            new_scale = self.snap_scale(new_scale)
         self.scale = max(self.min_scale, min(self.max_scale, new_scale))
         return self.scale
     
+    def snap_scale(self, scale: float) -> float:
+        """Retorna o nível da pirâmide (potência de 1/2) mais próximo se estiver dentro da tolerância"""
+        if scale <= 0 or scale > 1.0 + self.snap_tolerance:
+            return scale
+        level_scale = 2.0 ** -max(0, round(math.log2(1.0 / scale)))
+        if abs(scale - level_scale) <= level_scale * self.snap_tolerance:
+            return level_scale
+        return scale
+    
     def apply_pan(self, delta_x: int, delta_y: int):
         """Aplica movimento"""
         self.offset_x += delta_x
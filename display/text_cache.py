@@ -0,0 +1,120 @@
+"""Caches de fontes e de texto rasterizado (SRP)"""
+import math
+import threading
+from typing import Any, Dict, Hashable, Optional, Sequence, Tuple
+from PIL import Image, ImageDraw, ImageFont
+from .lru import LRUCache
+
+
+class FontCache:
+    """Mantém fontes TrueType abertas, por (arquivo, tamanho) (Single Responsibility)
+    
+    Os arquivos são tentados na ordem dada; falhas também ficam em cache para
+    que um arquivo ausente não seja procurado novamente a cada elemento.
+    """
+    
+    DEFAULT_PATHS = (
+        "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf",
+        "/usr/share/fonts/truetype/liberation/LiberationSans-Regular.ttf"
+    )
+    
+    _shared: Optional['FontCache'] = None
+    _shared_lock = threading.Lock()
+    
+    def __init__(self, paths: Sequence[str] = DEFAULT_PATHS, max_items: int = 64):
+        self.paths = tuple(paths)
+        self._fonts = LRUCache(max_items=max_items, sizeof=lambda font: 0)
+    
+    @classmethod
+    def shared(cls) -> 'FontCache':
+        """Instância compartilhada pelos renderizadores do processo"""
+        with cls._shared_lock:
+            if cls._shared is None:
+                cls._shared = cls()
+            return cls._shared
+    
+    def get(self, size: int) -> Tuple[Optional[Hashable], Optional[ImageFont.FreeTypeFont]]:
+        """Retorna (identificador, fonte) da primeira fonte que abre no tamanho pedido, ou (None, None)"""
+        for path in self.paths:
+            key = (path, size)
+            font = self._fonts.get(key, False)
+            if font is False:
+                try:
+                    font = ImageFont.truetype(path, size)
+                except Exception:
+                    font = None
+                self._fonts.put(key, font)
+            if font is not None:
+                return key, font
+        return None, None
+    
+    def stats(self) -> Dict[str, Any]:
+        return self._fonts.stats()
+
+
+class TextRunCache:
+    """Guarda linhas de texto já rasterizadas como máscaras, limitadas por bytes (Single Responsibility)
+    
+    A máscara (modo 'L') não depende da cor: a mesma linha é reaproveitada em
+    qualquer cor, compondo-a com Image.paste(cor, posição, máscara), que produz
+    o mesmo resultado de ImageDraw.text. A posição subpixel é arredondada para
+    QUANTIZATION de pixel e faz parte da chave.
+    """
+    
+    QUANTIZATION = 4
+    
+    _shared: Optional['TextRunCache'] = None
+    _shared_lock = threading.Lock()
+    
+    def __init__(self, max_bytes: int = 32 * 1024 * 1024):
+        self._runs = LRUCache(max_bytes=max_bytes, sizeof=lambda run: run[0].size[0] * run[0].size[1])
+    
+    @classmethod
+    def shared(cls) -> 'TextRunCache':
+        """Instância compartilhada pelos renderizadores do processo"""
+        with cls._shared_lock:
+            if cls._shared is None:
+                cls._shared = cls()
+            return cls._shared
+    
+    def draw(self, image: Image.Image, xy: Tuple[float, float], text: str, fill: Tuple[int, ...],
+             font: ImageFont.ImageFont, font_key: Hashable):
+        """Desenha uma linha de texto em image, como ImageDraw.text"""
+        if not text:
+            return
+        (x, fraction_x), (y, fraction_y) = self._split(xy[0]), self._split(xy[1])
+        key = (text, font_key, fraction_x, fraction_y)
+        run = self._runs.get(key)
+        if run is None:
+            run = self._rasterize(text, font, fraction_x, fraction_y)
+            self._runs.put(key, run)
+        mask, dx, dy = run
+        if mask.size[0] and mask.size[1]:
+            image.paste(fill, (x + dx, y + dy, x + dx + mask.size[0], y + dy + mask.size[1]), mask)
+    
+    @classmethod
+    def _split(cls, value: float) -> Tuple[int, float]:
+        """Separa a coordenada em parte inteira e fração quantizada"""
+        whole = math.floor(value)
+        fraction = round((value - whole) * cls.QUANTIZATION) / cls.QUANTIZATION
+        if fraction >= 1.0:
+            whole, fraction = whole + 1, 0.0
+        return int(whole), fraction
+    
+    @staticmethod
+    def _rasterize(text: str, font: ImageFont.ImageFont, fraction_x: float, fraction_y: float):
+        """Rasteriza a linha em uma máscara recortada e seu deslocamento em relação à origem"""
+        left, top, right, bottom = font.getbbox(text)
+        origin_x, origin_y = 1 - min(int(left), 0), 1 - min(int(top), 0)
+        canvas = Image.new('L', (origin_x + int(right) + 2, origin_y + int(bottom) + 2), 0)
+        ImageDraw.Draw(canvas).text((origin_x + fraction_x, origin_y + fraction_y), text, fill=255, font=font)
+        bbox = canvas.getbbox()
+        if bbox is None:
+            return Image.new('L', (0, 0)), 0, 0
+        return canvas.crop(bbox), bbox[0] - origin_x, bbox[1] - origin_y
+    
+    def clear(self):
+        self._runs.clear()
+    
+    def stats(self) -> Dict[str, Any]:
+        return self._runs.stats()
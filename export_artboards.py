@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Exporta os artboards de arquivos .xd como PNG, sem interface gráfica
+
+Uso:
+    python3 export_artboards.py arquivo.xd [outro.xd ...] -o saida [--scale 2] [--filter "Home*"]
+"""
+import argparse
+import fnmatch
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Any, Dict, List, Optional, Tuple
+
+from extraction import XDStructureAnalyzer, ArtboardExtractor, XDContentExtractor, XDArchive
+from display.artboard_renderer import ArtboardRenderer
+
+ARTBOARD_TYPES = ('artboard_json', 'artboard_manifest')
+
+# Renderizadores por arquivo .xd, mantidos em cada processo do pool (reaproveitam bitmaps decodificados)
+_renderers: Dict[str, ArtboardRenderer] = {}
+
+
+def list_artboards(xd_path: str, patterns: Optional[List[str]] = None) -> List[Tuple[int, Dict[str, Any]]]:
+    """Extrai (posição, artboard) do arquivo, opcionalmente filtrados por nome (padrões glob, sem diferenciar caixa)"""
+    extractor = XDContentExtractor(ArtboardExtractor(XDStructureAnalyzer()))
+    try:
+        content = extractor.extract_content(xd_path)
+    finally:
+        extractor.cleanup()
+    
+    artboards = [item for item in content if isinstance(item, dict) and item.get('type') in ARTBOARD_TYPES]
+    return [(position, item) for position, item in enumerate(artboards)
+            if not patterns or any(fnmatch.fnmatch(str(item.get('name', '')).lower(), p.lower()) for p in patterns)]
+
+
+def output_name(position: int, name: str) -> str:
+    """Nome do arquivo de saída: posição no documento (evita colisões) e nome do artboard"""
+    slug = re.sub(r'[^\w.-]+', '_', name).strip('._') or 'artboard'
+    return f"{position:03d}-{slug}.png"
+
+
+def output_directories(files: List[str], output: str) -> List[str]:
+    """Pasta de saída de cada arquivo: a própria output se houver um só; senão uma subpasta por arquivo
+    
+    A subpasta tem o nome do arquivo; nomes repetidos (ex.: a/x.xd e b/x.xd, sem
+    diferenciar caixa) recebem a posição do arquivo na linha de comando como prefixo.
+    """
+    if len(files) == 1:
+        return [output]
+    stems = [os.path.splitext(os.path.basename(path))[0] for path in files]
+    counts: Dict[str, int] = {}
+    for stem in stems:
+        counts[stem.lower()] = counts.get(stem.lower(), 0) + 1
+    return [os.path.join(output, stem if counts[stem.lower()] == 1 else f"{position + 1:02d}-{stem}")
+            for position, stem in enumerate(stems)]
+
+
+def render_to_file(xd_path: str, artboard_data: Dict[str, Any], scale: float,
+                   output_path: str) -> Tuple[float, Tuple[int, int]]:
+    """Renderiza um artboard e grava o PNG (executado no pool de processos); retorna (segundos, tamanho)"""
+    start = time.perf_counter()
+    renderer = _renderers.get(xd_path)
+    if renderer is None:
+        archive = XDArchive(xd_path)
+        renderer = _renderers[xd_path] = ArtboardRenderer(archive.root, archive)
+    image = renderer.render_artboard(artboard_data, scale=scale)
+    image.save(output_path, 'PNG')
+    return time.perf_counter() - start, image.size
+
+
+def available_cores() -> int:
+    """Núcleos que este processo pode usar (respeita afinidade/cgroups quando disponível)"""
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Exporta os artboards de arquivos .xd como PNG")
+    parser.add_argument('files', nargs='+', help="arquivos .xd")
+    parser.add_argument('-o', '--output', default='export', help="pasta de saída (padrão: export)")
+    parser.add_argument('-s', '--scale', type=float, default=1.0, help="escala de renderização (padrão: 1.0)")
+    parser.add_argument('-f', '--filter', action='append', dest='patterns', metavar='PADRÃO',
+                        help="exporta só artboards cujo nome casa com o padrão glob (pode repetir)")
+    parser.add_argument('-j', '--jobs', type=int, default=available_cores(),
+                        help="processos de renderização (padrão: núcleos disponíveis)")
+    args = parser.parse_args(argv)
+    if args.scale <= 0:
+        parser.error("--scale deve ser maior que zero")
+    if args.jobs < 1:
+        parser.error("--jobs deve ser ao menos 1")
+    return args
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = parse_args(argv)
+    start = time.perf_counter()
+    
+    # Extração no processo principal; cada arquivo vai para sua própria pasta se houver vários
+    tasks = []
+    failures = 0
+    for xd_path, directory in zip(args.files, output_directories(args.files, args.output)):
+        try:
+            artboards = list_artboards(xd_path, args.patterns)
+        except Exception as e:
+            print(f"✗ {xd_path}: {e}", file=sys.stderr)
+            failures += 1
+            continue
+        os.makedirs(directory, exist_ok=True)
+        for position, item in artboards:
+            name = str(item.get('name', 'artboard'))
+            tasks.append((xd_path, name, item['data'], os.path.join(directory, output_name(position, name))))
+    extract_seconds = time.perf_counter() - start
+    print(f"{len(tasks)} artboard(s) em {len(args.files)} arquivo(s), extraídos em {extract_seconds:.2f}s")
+    
+    render_seconds = 0.0
+    pixels = 0
+    exported = 0
+    workers = min(args.jobs, max(1, len(tasks)))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(render_to_file, xd_path, data, args.scale, output_path): (xd_path, name, output_path)
+                   for xd_path, name, data, output_path in tasks}
+        for future in as_completed(futures):
+            xd_path, name, output_path = futures[future]
+            try:
+                seconds, size = future.result()
+            except Exception as e:
+                print(f"✗ {os.path.basename(xd_path)} / {name}: {e}", file=sys.stderr)
+                failures += 1
+                continue
+            exported += 1
+            render_seconds += seconds
+            pixels += size[0] * size[1]
+            print(f"{seconds * 1000:9.1f} ms  {size[0]:>5}x{size[1]:<5}  {output_path}")
+    
+    elapsed = time.perf_counter() - start
+    print(f"\n{exported} artboard(s) exportado(s) em {elapsed:.2f}s "
+          f"({exported / elapsed if elapsed else 0:.1f} artboards/s, {pixels / 1e6 / elapsed if elapsed else 0:.1f} Mpx/s, "
+          f"{workers} processo(s), {render_seconds:.2f}s de renderização somada)")
+    if failures:
+        print(f"{failures} falha(s)", file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
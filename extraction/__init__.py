@@ -2,6 +2,10 @@
 from .analyzer import XDStructureAnalyzer
 from .artboard_extractor import ArtboardExtractor
 from .content_extractor import XDContentExtractor
+from .archive import XDArchive, DirectorySource
+from .project_index import ProjectIndex
+from .json_cache import JSONDocumentCache
+from .reference_index import ReferenceIndex
 
-__all__ = ['XDStructureAnalyzer', 'ArtboardExtractor', 'XDContentExtractor']
+__all__ = ['XDStructureAnalyzer', 'ArtboardExtractor', 'XDContentExtractor', 'XDArchive', 'DirectorySource', 'ProjectIndex', 'JSONDocumentCache', 'ReferenceIndex']
 
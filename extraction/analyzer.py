@@ -1,16 +1,40 @@
 """Análise de estrutura XD (SRP)"""
 import os
 import json
-from typing import Dict, Any, List
-from interfaces import IProjectParser
+from typing import Dict, Any, List, Union, Optional, Callable
+from interfaces import IProjectParser, IResourceSource
+from .archive import as_source
+from .project_index import ProjectIndex
+from .json_cache import JSONDocumentCache
 
 
 class XDStructureAnalyzer(IProjectParser):
     """Analisa estrutura interna de arquivos .xd (Single Responsibility)"""
     
-    def parse_structure(self, directory: str) -> Dict[str, Any]:
-        """Analisa estrutura do projeto .xd"""
+    def __init__(self, json_cache: Optional[JSONDocumentCache] = None):
+        # Cache compartilhado com o extrator: cada JSON do documento é interpretado uma vez
+        self.json_cache = json_cache or JSONDocumentCache()
+    
+    def parse_structure(self, directory: Union[str, IResourceSource],
+                        progress: Optional[Callable[[str, int, int], None]] = None,
+                        on_artboard_json: Optional[Callable[[str], None]] = None) -> Dict[str, Any]:
+        """Analisa estrutura do projeto .xd (diretório extraído ou arquivo aberto)
+        
+        progress(etapa, feitos, total) é chamado a cada etapa/arquivo e pode
+        interromper a análise lançando uma exceção; on_artboard_json recebe cada
+        JSON de artboard assim que é identificado.
+        """
+        source = as_source(directory)
+        directory = source.root
+        # Uma única varredura da árvore; as buscas abaixo consultam o índice
+        if progress:
+            progress('index', 0, 0)
+        index = ProjectIndex.build(source)
+        self.json_cache.bind(source)
         structure = {
+            'source': source,
+            'index': index,
+            'json_cache': self.json_cache,
             'manifest': None,
             'artboards': [],
             'artboard_jsons': [],
@@ -22,40 +46,31 @@ class XDStructureAnalyzer(IProjectParser):
         
         # Procurar manifest.json
         manifest_path = os.path.join(directory, 'manifest.json')
-        if os.path.exists(manifest_path):
+        if index.exists(manifest_path):
             try:
-                with open(manifest_path, 'r', encoding='utf-8') as f:
-                    structure['manifest'] = json.load(f)
-                    # Extrair informações de artboards do manifest
-                    structure['artboards'] = self._extract_artboards_from_manifest(structure['manifest'])
-            except (json.JSONDecodeError, IOError):
+                structure['manifest'] = self.json_cache.load(manifest_path)
+                # Extrair informações de artboards do manifest
+                structure['artboards'] = self._extract_artboards_from_manifest(structure['manifest'])
+            except (json.JSONDecodeError, IOError, UnicodeDecodeError):
                 pass
         
         # Identificar pastas principais
-        for item in os.listdir(directory):
-            item_path = os.path.join(directory, item)
-            if os.path.isdir(item_path):
-                item_lower = item.lower()
-                if 'artwork' in item_lower or 'artboards' in item_lower:
-                    structure['artwork_path'] = item_path
-                elif 'resources' in item_lower:
-                    structure['resources_path'] = item_path
-                elif 'graphics' in item_lower:
-                    structure['graphics_path'] = item_path
+        for item in index.top_level_directories:
+            role = ProjectIndex.folder_role(item)
+            if role:
+                structure[f'{role}_path'] = os.path.join(directory, item)
         
         # Se não encontrou pastas nomeadas, procurar por estrutura comum
         if not structure['artwork_path']:
-            for root, dirs, files in os.walk(directory):
+            for json_path in index.json_files:
                 # Procurar por arquivos que indicam artboards
-                for file in files:
-                    if file.endswith('.json') and ('artboard' in file.lower() or 'board' in file.lower()):
-                        structure['artwork_path'] = root
-                        break
-                if structure['artwork_path']:
+                file = os.path.basename(json_path).lower()
+                if 'artboard' in file or 'board' in file:
+                    structure['artwork_path'] = os.path.dirname(json_path)
                     break
         
         # Buscar arquivos JSON de artboards
-        structure['artboard_jsons'] = self._find_artboard_json_files(directory, structure)
+        structure['artboard_jsons'] = self._find_artboard_json_files(directory, structure, progress, on_artboard_json)
         
         return structure
     
@@ -97,7 +112,9 @@ class XDStructureAnalyzer(IProjectParser):
         search_for_artboards(manifest)
         return artboards
     
-    def _find_artboard_json_files(self, directory: str, structure: Dict[str, Any]) -> List[str]:
+    def _find_artboard_json_files(self, directory: str, structure: Dict[str, Any],
+                                  progress: Optional[Callable[[str, int, int], None]] = None,
+                                  on_artboard_json: Optional[Callable[[str], None]] = None) -> List[str]:
         """Encontra arquivos JSON que podem conter dados de artboards"""
         json_files = []
         searched_paths = []
@@ -114,23 +131,25 @@ class XDStructureAnalyzer(IProjectParser):
         if not searched_paths:
             searched_paths.append(directory)
         
-        for search_path in searched_paths:
-            for root, dirs, files in os.walk(search_path):
-                for file in files:
-                    if file.endswith('.json'):
-                        json_path = os.path.join(root, file)
-                        # Verificar se o JSON contém dados de artboard
-                        if self._is_artboard_json(json_path):
-                            json_files.append(json_path)
+        candidates = [json_path for search_path in searched_paths
+                      for json_path in structure['index'].files_under(search_path)
+                      if json_path.endswith('.json')]
+        for position, json_path in enumerate(candidates):
+            if progress:
+                progress('parse', position, len(candidates))
+            # Verificar se o JSON contém dados de artboard
+            if self._is_artboard_json(json_path):
+                json_files.append(json_path)
+                if on_artboard_json:
+                    on_artboard_json(json_path)
         
         return json_files
     
     def _is_artboard_json(self, json_path: str) -> bool:
         """Verifica se um arquivo JSON contém dados de artboard"""
         try:
-            with open(json_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                
+            data = self.json_cache.load(json_path)
+            
             # Verificar se contém indicadores de artboard
             if isinstance(data, dict):
                 # Verificar tipo
@@ -0,0 +1,228 @@
+"""Acesso preguiçoso a arquivos .xd (SRP)"""
+import hashlib
+import io
+import os
+import threading
+import zipfile
+from typing import Dict, List, Set, Iterator, Tuple, BinaryIO, Union, Optional
+from interfaces import IResourceSource
+
+
+class XDArchive(IResourceSource):
+    """Expõe os membros de um .xd (ZIP) por nome, descompactando sob demanda (Single Responsibility)
+    
+    O diretório central é lido uma única vez. Os caminhos são "virtuais": o próprio
+    caminho do .xd funciona como raiz, de modo que os.path.join/basename/normpath
+    continuam funcionando como em um diretório extraído.
+    
+    Instâncias podem ser enviadas a outros processos (pickle): o arquivo ZIP
+    aberto não é copiado e é reaberto no destino no primeiro acesso.
+    """
+    
+    def __init__(self, xd_file_path: str):
+        self.xd_file_path = xd_file_path
+        self.root = os.path.normpath(os.path.abspath(xd_file_path))
+        self._lock = threading.Lock()
+        # Cópias recebidas de outro processo reabrem o ZIP sob demanda
+        self._reopen = False
+        try:
+            self._zip = zipfile.ZipFile(xd_file_path, 'r')
+        except zipfile.BadZipFile:
+            raise ValueError("O arquivo não é um arquivo .xd válido")
+        
+        self._members: Dict[str, zipfile.ZipInfo] = {}
+        self._signature: Optional[str] = None
+        self._children: Dict[str, Set[str]] = {'': set()}
+        for info in self._zip.infolist():
+            relative = self._normalize_member(info.filename)
+            if not relative:
+                continue
+            if not info.is_dir():
+                self._members[relative] = info
+            self._register_parents(relative, info.is_dir())
+    
+    @staticmethod
+    def _normalize_member(name: str) -> str:
+        """Normaliza o nome de um membro do ZIP para 'pasta/arquivo'"""
+        parts = [part for part in name.replace('\\', '/').split('/') if part not in ('', '.', '..')]
+        return '/'.join(parts)
+    
+    def _register_parents(self, relative: str, is_dir: bool):
+        """Registra as pastas implícitas de um membro"""
+        if is_dir:
+            self._children.setdefault(relative, set())
+        parent, _, name = relative.rpartition('/')
+        while True:
+            self._children.setdefault(parent, set()).add(name)
+            if not parent:
+                break
+            parent, _, name = parent.rpartition('/')
+    
+    def _relative(self, path: str) -> Optional[str]:
+        """Converte um caminho virtual em nome de membro (None se estiver fora do arquivo)"""
+        normalized = os.path.normpath(os.path.abspath(path))
+        if normalized == self.root:
+            return ''
+        prefix = self.root + os.sep
+        if not normalized.startswith(prefix):
+            return None
+        return normalized[len(prefix):].replace(os.sep, '/')
+    
+    def path_for(self, member: str) -> str:
+        """Converte um nome de membro em caminho virtual"""
+        return os.path.join(self.root, *member.split('/')) if member else self.root
+    
+    def exists(self, path: str) -> bool:
+        """Verifica se o caminho existe (arquivo ou pasta)"""
+        relative = self._relative(path)
+        return relative is not None and (relative in self._members or relative in self._children)
+    
+    def isdir(self, path: str) -> bool:
+        """Verifica se o caminho é uma pasta"""
+        relative = self._relative(path)
+        return relative is not None and relative in self._children
+    
+    def listdir(self, path: str) -> List[str]:
+        """Lista os nomes contidos em uma pasta"""
+        relative = self._relative(path)
+        if relative is None or relative not in self._children:
+            raise FileNotFoundError(path)
+        return sorted(self._children[relative])
+    
+    def walk(self, top: str) -> Iterator[Tuple[str, List[str], List[str]]]:
+        """Percorre a árvore de pastas (mesmo formato de os.walk)"""
+        relative = self._relative(top)
+        if relative is None or relative not in self._children:
+            return
+        pending = [relative]
+        while pending:
+            current = pending.pop(0)
+            dirnames, filenames = [], []
+            for name in sorted(self._children[current]):
+                child = f"{current}/{name}" if current else name
+                if child in self._children:
+                    dirnames.append(name)
+                else:
+                    filenames.append(name)
+            yield self.path_for(current), dirnames, filenames
+            pending[0:0] = [f"{current}/{name}" if current else name for name in dirnames]
+    
+    def open(self, path: str) -> BinaryIO:
+        """Descompacta um membro e o retorna como arquivo em memória"""
+        relative = self._relative(path)
+        info = self._members.get(relative) if relative is not None else None
+        if info is None:
+            raise FileNotFoundError(path)
+        with self._lock:
+            if self._zip is None:
+                if not self._reopen:
+                    raise ValueError("Arquivo .xd já foi fechado")
+                self._zip = zipfile.ZipFile(self.xd_file_path, 'r')
+            archive = self._zip
+        # Fora do lock: ZipFile aceita leituras concorrentes (a descompactação roda em paralelo)
+        return io.BytesIO(archive.read(info))
+    
+    def content_key(self, path: str) -> str:
+        """CRC32 e tamanho do membro, lidos do diretório central (sem descompactar)
+        
+        Para a raiz, retorna uma assinatura de todos os membros do documento.
+        """
+        relative = self._relative(path)
+        if relative == '':
+            if self._signature is None:
+                digest = hashlib.sha1()
+                for name in sorted(self._members):
+                    info = self._members[name]
+                    digest.update(f"{name}\0{info.CRC:08x}\0{info.file_size}\n".encode('utf-8'))
+                self._signature = f"xd:{digest.hexdigest()}"
+            return self._signature
+        info = self._members.get(relative) if relative is not None else None
+        if info is None:
+            raise FileNotFoundError(path)
+        return f"crc32:{info.CRC:08x}:{info.file_size}"
+    
+    def close(self):
+        """Fecha o arquivo .xd"""
+        with self._lock:
+            self._reopen = False
+            if self._zip is not None:
+                self._zip.close()
+                self._zip = None
+    
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['_zip'] = None
+        state['_lock'] = None
+        state['_reopen'] = True
+        return state
+    
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+
+class DirectorySource(IResourceSource):
+    """Acesso a um projeto já extraído em disco (Single Responsibility)"""
+    
+    def __init__(self, directory: str):
+        self.root = directory
+        # Hashes já calculados, válidos enquanto tamanho e mtime não mudarem
+        self._content_keys: Dict[Tuple[str, int, int], str] = {}
+        # Assinatura da raiz, calculada uma vez por fonte (como a de XDArchive)
+        self._signature: Optional[str] = None
+    
+    def exists(self, path: str) -> bool:
+        return os.path.exists(path)
+    
+    def isdir(self, path: str) -> bool:
+        return os.path.isdir(path)
+    
+    def listdir(self, path: str) -> List[str]:
+        return os.listdir(path)
+    
+    def walk(self, top: str) -> Iterator[Tuple[str, List[str], List[str]]]:
+        return os.walk(top)
+    
+    def open(self, path: str) -> BinaryIO:
+        return open(path, 'rb')
+    
+    def content_key(self, path: str) -> str:
+        """SHA-1 do conteúdo do arquivo; para pastas, assinatura de nomes, tamanhos e datas
+        
+        A assinatura da raiz é calculada na primeira chamada e reaproveitada
+        enquanto a fonte estiver aberta.
+        """
+        if os.path.isdir(path):
+            if os.path.normpath(path) != os.path.normpath(self.root):
+                return self._directory_signature(path)
+            if self._signature is None:
+                self._signature = self._directory_signature(path)
+            return self._signature
+        
+        digest = hashlib.sha1()
+        stat = os.stat(path)
+        memo = (os.path.normpath(path), stat.st_size, stat.st_mtime_ns)
+        if memo not in self._content_keys:
+            with open(path, 'rb') as f:
+                for chunk in iter(lambda: f.read(1024 * 1024), b''):
+                    digest.update(chunk)
+            self._content_keys[memo] = f"sha1:{digest.hexdigest()}"
+        return self._content_keys[memo]
+    
+    @staticmethod
+    def _directory_signature(path: str) -> str:
+        digest = hashlib.sha1()
+        for dirpath, dirnames, filenames in os.walk(path):
+            dirnames.sort()
+            for filename in sorted(filenames):
+                file_stat = os.stat(os.path.join(dirpath, filename))
+                relative = os.path.relpath(os.path.join(dirpath, filename), path)
+                digest.update(f"{relative}\0{file_stat.st_size}\0{file_stat.st_mtime_ns}\n".encode('utf-8'))
+        return f"dir:{digest.hexdigest()}"
+
+
+def as_source(location: Union[str, IResourceSource]) -> IResourceSource:
+    """Aceita um diretório ou uma fonte já aberta e retorna a fonte correspondente"""
+    if isinstance(location, IResourceSource):
+        return location
+    return DirectorySource(location)
@@ -1,41 +1,61 @@
 """Extrator de artboards (SRP)"""
 import os
 import json
-from pathlib import Path
-from typing import List, Set, Any, Dict, Union
+from typing import List, Set, Any, Dict, Union, Optional, Callable
+from interfaces import IResourceSource
 from .analyzer import XDStructureAnalyzer
+from .archive import as_source
+from .project_index import ProjectIndex
+from .reference_index import ReferenceIndex
 
 
 class ArtboardExtractor:
     """Extrai artboards do projeto .xd (Single Responsibility)"""
     
-    IMAGE_EXTENSIONS = {'.png', '.jpg', '.jpeg', '.gif', '.bmp', '.webp', '.svg'}
+    IMAGE_EXTENSIONS = ProjectIndex.IMAGE_EXTENSIONS
     
     def __init__(self, structure_analyzer: XDStructureAnalyzer):
         self.structure_analyzer = structure_analyzer
+        # Verificações de existência respondidas pelo índice em vez da fonte (ex.: os.path.exists)
+        self.fs_calls_avoided = 0
     
-    def extract_artboards(self, directory: str) -> List[Union[str, Dict[str, Any]]]:
-        """Extrai todos os artboards encontrados (imagens e JSONs)"""
-        structure = self.structure_analyzer.parse_structure(directory)
+    def extract_artboards(self, directory: Union[str, IResourceSource],
+                          progress: Optional[Callable[[str, int, int], None]] = None,
+                          on_item: Optional[Callable[[Union[str, Dict[str, Any]]], None]] = None
+                          ) -> List[Union[str, Dict[str, Any]]]:
+        """Extrai todos os artboards encontrados (imagens e JSONs)
+        
+        on_item recebe cada entrada assim que é descoberta, na mesma ordem da lista final.
+        """
+        source = as_source(directory)
+        directory = source.root
+        json_cache = self.structure_analyzer.json_cache
         content_items = []
+        self.fs_calls_avoided = 0
         
-        # Primeiro, adicionar artboards JSON (prioridade)
-        for json_path in structure.get('artboard_jsons', []):
+        def add_item(item: Union[str, Dict[str, Any]]):
+            content_items.append(item)
+            if on_item:
+                on_item(item)
+        
+        # Primeiro, adicionar artboards JSON (prioridade), à medida que são identificados
+        def add_artboard_json(json_path: str):
             try:
-                with open(json_path, 'r', encoding='utf-8') as f:
-                    artboard_data = json.load(f)
-                    # Criar entrada de artboard com metadados
-                    artboard_entry = {
-                        'type': 'artboard_json',
-                        'path': json_path,
-                        'data': artboard_data,
-                        'name': self._extract_artboard_name(artboard_data, json_path),
-                        'width': artboard_data.get('width', artboard_data.get('w', 0)),
-                        'height': artboard_data.get('height', artboard_data.get('h', 0))
-                    }
-                    content_items.append(artboard_entry)
+                artboard_data = json_cache.load(json_path)
             except (json.JSONDecodeError, IOError, UnicodeDecodeError):
-                continue
+                return
+            # Criar entrada de artboard com metadados
+            add_item({
+                'type': 'artboard_json',
+                'path': json_path,
+                'data': artboard_data,
+                'name': self._extract_artboard_name(artboard_data, json_path),
+                'width': artboard_data.get('width', artboard_data.get('w', 0)),
+                'height': artboard_data.get('height', artboard_data.get('h', 0))
+            })
+        
+        structure = self.structure_analyzer.parse_structure(source, progress, add_artboard_json)
+        index: ProjectIndex = structure['index']
         
         # Adicionar artboards do manifest
         for artboard_info in structure.get('artboards', []):
@@ -48,30 +68,25 @@ class ArtboardExtractor:
                     'width': artboard_info.get('width', 0),
                     'height': artboard_info.get('height', 0)
                 }
-                content_items.append(artboard_entry)
+                add_item(artboard_entry)
         
         # Buscar imagens (fallback e recursos)
         image_paths = set()
         
-        # Buscar em artwork/artboards
-        if structure['artwork_path']:
-            image_paths.update(self._find_in_directory(structure['artwork_path']))
-        
-        # Buscar em resources (pode conter artboards exportados)
-        if structure['resources_path']:
-            image_paths.update(self._find_in_directory(structure['resources_path']))
-        
-        # Buscar em toda a estrutura (fallback)
-        image_paths.update(self._find_in_directory(directory))
+        # Buscar em toda a estrutura (já inclui artwork/artboards e resources)
+        image_paths.update(index.images_under(directory))
         
         # Buscar referências em JSON
-        image_paths.update(self._find_in_json_files(directory, structure))
+        image_paths.update(self._find_in_json_files(directory, structure, progress))
+        
+        # Referências de todos os artboards, coletadas uma única vez
+        references = ReferenceIndex.from_items(content_items, directory)
         
         # Adicionar imagens como entradas simples (strings)
         for img_path in sorted(image_paths):
             # Verificar se não é uma imagem já referenciada por um artboard JSON
-            if not self._is_image_in_artboard(img_path, content_items):
-                content_items.append(img_path)
+            if not references.is_referenced(img_path):
+                add_item(img_path)
         
         return content_items
     
@@ -90,68 +105,44 @@ class ArtboardExtractor:
         filename = os.path.basename(json_path)
         return os.path.splitext(filename)[0]
     
-    def _is_image_in_artboard(self, image_path: str, content_items: List[Union[str, Dict[str, Any]]]) -> bool:
-        """Verifica se uma imagem já está referenciada em um artboard JSON"""
-        image_name = os.path.basename(image_path)
-        for item in content_items:
-            if isinstance(item, dict) and item.get('type') in ['artboard_json', 'artboard_manifest']:
-                # Verificar se a imagem está referenciada nos dados do artboard
-                data = item.get('data', {})
-                if self._image_referenced_in_data(data, image_name, image_path):
-                    return True
-        return False
-    
-    def _image_referenced_in_data(self, data: Any, image_name: str, image_path: str) -> bool:
-        """Verifica recursivamente se uma imagem está referenciada nos dados"""
-        if isinstance(data, dict):
-            for key, value in data.items():
-                if isinstance(value, str):
-                    if image_name in value or image_path in value:
-                        return True
-                elif isinstance(value, (dict, list)):
-                    if self._image_referenced_in_data(value, image_name, image_path):
-                        return True
-        elif isinstance(data, list):
-            for item in data:
-                if self._image_referenced_in_data(item, image_name, image_path):
-                    return True
-        return False
-    
-    def _find_in_directory(self, directory: str) -> Set[str]:
-        """Encontra imagens em um diretório"""
-        image_paths = set()
-        
-        for root, dirs, files in os.walk(directory):
-            for file in files:
-                file_path = Path(file)
-                if file_path.suffix.lower() in self.IMAGE_EXTENSIONS:
-                    full_path = os.path.join(root, file)
-                    normalized_path = os.path.normpath(full_path)
-                    image_paths.add(normalized_path)
-        
-        return image_paths
-    
-    def _find_in_json_files(self, directory: str, structure: Dict) -> Set[str]:
+    def _find_in_json_files(self, directory: str, structure: Dict,
+                            progress: Optional[Callable[[str, int, int], None]] = None) -> Set[str]:
         """Encontra referências a imagens em arquivos JSON"""
         image_paths = set()
         
         # Buscar em todos os JSONs
-        for root, dirs, files in os.walk(directory):
-            for file in files:
-                if file.endswith('.json'):
-                    json_path = os.path.join(root, file)
-                    try:
-                        with open(json_path, 'r', encoding='utf-8') as f:
-                            data = json.load(f)
-                            found_paths = self._extract_paths_from_json(data, directory)
-                            normalized_paths = {os.path.normpath(p) for p in found_paths if os.path.exists(p)}
-                            image_paths.update(normalized_paths)
-                    except (json.JSONDecodeError, IOError, UnicodeDecodeError):
-                        continue
+        index: ProjectIndex = structure['index']
+        for position, json_path in enumerate(index.json_files):
+            if progress:
+                progress('parse', position, len(index.json_files))
+            try:
+                data = structure['json_cache'].load(json_path)
+                found_paths = self._extract_paths_from_json(index, data, directory)
+                # Caminhos já verificados em _extract_paths_from_json: não é preciso consultar de novo
+                self.fs_calls_avoided += len(found_paths)
+                normalized_paths = {os.path.normpath(p) for p in found_paths}
+                image_paths.update(normalized_paths)
+            except (json.JSONDecodeError, IOError, UnicodeDecodeError):
+                continue
         
         return image_paths
     
-    def _extract_paths_from_json(self, data: Any, base_dir: str) -> List[str]:
+    def _path_exists(self, index: ProjectIndex, path: str) -> bool:
+        """Verifica a existência de um caminho no índice, com o mesmo resultado de os.path.exists"""
+        normalized = os.path.normpath(path)
+        parts = path.replace('\\', '/').split('/')
+        root = os.path.normpath(index.root)
+        # Casos em que a normalização textual pode divergir do sistema de arquivos:
+        # caminhos fora do projeto e componentes '..' (que exigem pastas intermediárias existentes)
+        if '..' in parts or not (normalized == root or normalized.startswith(root + os.sep)):
+            return index.source.exists(path)
+        
+        self.fs_calls_avoided += 1
+        if path.endswith(os.sep) or (os.altsep and path.endswith(os.altsep)):
+            return normalized in index.directories
+        return index.exists(normalized)
+    
+    def _extract_paths_from_json(self, index: ProjectIndex, data: Any, base_dir: str) -> List[str]:
         """Extrai caminhos de imagens de estruturas JSON recursivamente"""
         image_paths = []
         
@@ -161,19 +152,19 @@ class ArtboardExtractor:
                     # Verificar se é caminho de imagem
                     if any(value.lower().endswith(ext) for ext in self.IMAGE_EXTENSIONS):
                         full_path = os.path.join(base_dir, value)
-                        if os.path.exists(full_path):
+                        if self._path_exists(index, full_path):
                             image_paths.append(full_path)
                     # Verificar se é referência relativa
                     elif '/' in value or '\\' in value:
                         # Tentar construir caminho
                         possible_path = os.path.join(base_dir, value)
-                        if os.path.exists(possible_path):
+                        if self._path_exists(index, possible_path):
                             image_paths.append(possible_path)
                 else:
-                    image_paths.extend(self._extract_paths_from_json(value, base_dir))
+                    image_paths.extend(self._extract_paths_from_json(index, value, base_dir))
         elif isinstance(data, list):
             for item in data:
-                image_paths.extend(self._extract_paths_from_json(item, base_dir))
+                image_paths.extend(self._extract_paths_from_json(index, item, base_dir))
         
         return image_paths
 
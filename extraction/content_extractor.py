@@ -1,11 +1,8 @@
 """Extrator de conteúdo XD (SRP + DIP)"""
-import os
-import zipfile
-import tempfile
-import shutil
-from typing import List, Optional
-from interfaces import IContentExtractor
+from typing import List, Optional, Callable, Union, Dict, Any
+from interfaces import IContentExtractor, IResourceSource
 from .artboard_extractor import ArtboardExtractor
+from .archive import XDArchive
 
 
 class XDContentExtractor(IContentExtractor):
@@ -13,40 +10,74 @@ class XDContentExtractor(IContentExtractor):
     
     def __init__(self, artboard_extractor: ArtboardExtractor):
         self.artboard_extractor = artboard_extractor
-        self.temp_dir: Optional[str] = None
+        self.archive: Optional[XDArchive] = None
     
-    def extract_content(self, xd_file_path: str) -> List[str]:
-        """Extrai todo o conteúdo visual do arquivo .xd"""
-        self.cleanup()
-        
-        # Criar diretório temporário
-        self.temp_dir = tempfile.mkdtemp(prefix="xd_viewer_")
+    def extract_content(self, xd_file_path: str,
+                        progress: Optional[Callable[[str, int, int], None]] = None,
+                        on_item: Optional[Callable[[Union[str, Dict[str, Any]], IResourceSource], None]] = None
+                        ) -> List[str]:
+        """Extrai todo o conteúdo visual do arquivo .xd e o torna o documento atual
         
-        # Extrair arquivo .xd (ZIP)
+        O documento atual só é substituído quando a extração termina com sucesso;
+        se progress interromper a extração (ex.: cancelamento), o novo arquivo é fechado.
+        """
+        if progress:
+            progress('unzip', 0, 0)
+        archive = self.open_archive(xd_file_path)
         try:
-            with zipfile.ZipFile(xd_file_path, 'r') as zip_ref:
-                zip_ref.extractall(self.temp_dir)
-        except zipfile.BadZipFile:
-            raise ValueError("O arquivo não é um arquivo .xd válido")
+            content_paths = self.extract_from_archive(archive, progress, on_item)
+        except BaseException:
+            archive.close()
+            raise
         
-        # Extrair artboards e conteúdo visual
-        content_paths = self.artboard_extractor.extract_artboards(self.temp_dir)
+        self.set_archive(archive)
+        return content_paths
+    
+    def open_archive(self, xd_file_path: str) -> XDArchive:
+        """Abre o arquivo .xd (ZIP) sem extraí-lo nem substituir o documento atual: membros são lidos sob demanda"""
+        return XDArchive(xd_file_path)
+    
+    def extract_from_archive(self, archive: XDArchive,
+                             progress: Optional[Callable[[str, int, int], None]] = None,
+                             on_item: Optional[Callable[[Union[str, Dict[str, Any]], IResourceSource], None]] = None
+                             ) -> List[str]:
+        """Extrai artboards e conteúdo visual de um arquivo aberto (não o fecha em caso de erro)"""
+        content_paths = self.artboard_extractor.extract_artboards(
+            archive,
+            progress,
+            (lambda item: on_item(item, archive)) if on_item else None
+        )
         
         if not content_paths:
             raise ValueError("Nenhum conteúdo visual encontrado no arquivo .xd")
-        
         return content_paths
     
-    def get_temp_dir(self) -> Optional[str]:
-        """Retorna diretório temporário atual"""
-        return self.temp_dir
+    def set_archive(self, archive: XDArchive):
+        """Torna o arquivo o documento atual e fecha o anterior
+        
+        Deve ser chamado na thread que usa o documento (no visualizador, a do Tk),
+        depois que os consumidores do arquivo anterior já foram trocados.
+        """
+        if archive is self.archive:
+            return
+        self.cleanup()
+        self.archive = archive
+    
+    def close_archive(self, archive: Optional[XDArchive]):
+        """Fecha um arquivo aberto por open_archive que não se tornou o documento atual"""
+        if archive is not None and archive is not self.archive:
+            archive.close()
+    
+    def get_base_directory(self) -> Optional[str]:
+        """Retorna a raiz (virtual) dos caminhos do arquivo atual"""
+        return self.archive.root if self.archive else None
+    
+    def get_archive(self) -> Optional[IResourceSource]:
+        """Retorna a fonte de recursos do arquivo atual"""
+        return self.archive
     
     def cleanup(self):
-        """Limpa recursos temporários"""
-        if self.temp_dir and os.path.exists(self.temp_dir):
-            try:
-                shutil.rmtree(self.temp_dir)
-            except OSError:
-                pass
-        self.temp_dir = None
-
+        """Libera recursos do arquivo atual"""
+        if self.archive is not None:
+            self.archive.close()
+        self.archive = None
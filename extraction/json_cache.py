@@ -0,0 +1,72 @@
+"""Cache de documentos JSON do projeto (SRP)"""
+import json
+import os
+import threading
+from typing import Any, Dict, Optional
+from interfaces import IResourceSource
+
+
+class JSONDocumentCache:
+    """Interpreta cada JSON do documento uma única vez e compartilha o resultado (Single Responsibility)
+    
+    O cache é associado a uma fonte de recursos e descartado quando a fonte
+    (documento aberto) muda. Erros de leitura também ficam em cache, para que
+    um arquivo inválido não seja relido a cada consulta.
+    """
+    
+    def __init__(self):
+        self._source: Optional[IResourceSource] = None
+        self._documents: Dict[str, Any] = {}
+        self._errors: Dict[str, Exception] = {}
+        self._lock = threading.Lock()
+        self.parses = 0
+        self.bytes_parsed = 0
+        self.hits = 0
+    
+    def bind(self, source: IResourceSource):
+        """Associa o cache a um documento, descartando o conteúdo se o documento mudou"""
+        with self._lock:
+            if source is not self._source:
+                self._source = source
+                self._documents.clear()
+                self._errors.clear()
+                self.parses = 0
+                self.bytes_parsed = 0
+                self.hits = 0
+    
+    def load(self, path: str) -> Any:
+        """Retorna o JSON interpretado do caminho, lendo-o apenas na primeira vez"""
+        key = os.path.normpath(path)
+        with self._lock:
+            if key in self._documents:
+                self.hits += 1
+                return self._documents[key]
+            if key in self._errors:
+                self.hits += 1
+                raise self._errors[key]
+        
+        try:
+            with self._source.open(path) as f:
+                raw = f.read()
+            data = json.loads(raw)
+        except (json.JSONDecodeError, IOError, UnicodeDecodeError) as e:
+            with self._lock:
+                self._errors[key] = e
+            raise
+        
+        with self._lock:
+            self.parses += 1
+            self.bytes_parsed += len(raw)
+            self._documents[key] = data
+        return data
+    
+    def stats(self) -> Dict[str, int]:
+        """Retorna quantidade de arquivos interpretados, bytes lidos e acertos do cache"""
+        with self._lock:
+            return {
+                'documents': len(self._documents),
+                'errors': len(self._errors),
+                'parses': self.parses,
+                'bytes_parsed': self.bytes_parsed,
+                'hits': self.hits
+            }
@@ -0,0 +1,106 @@
+"""Índice de arquivos do projeto XD (SRP)"""
+import os
+from typing import Dict, List, Optional, Set, Union
+from interfaces import IResourceSource
+from .archive import as_source
+
+
+class ProjectIndex:
+    """Classifica todos os arquivos do projeto em uma única varredura (Single Responsibility)"""
+    
+    IMAGE_EXTENSIONS = {'.png', '.jpg', '.jpeg', '.gif', '.bmp', '.webp', '.svg'}
+    
+    def __init__(self, source: IResourceSource):
+        self.source = source
+        self.root = source.root
+        self.files: List[str] = []
+        self.json_files: List[str] = []
+        self.image_files: List[str] = []
+        self.paths: Set[str] = set()
+        self.directories: Set[str] = set()
+        self.top_level_directories: List[str] = []
+        self.by_basename: Dict[str, List[str]] = {}
+        self.by_role: Dict[str, List[str]] = {}
+        self._files_under: Dict[str, List[str]] = {}
+        self._images_under: Dict[str, List[str]] = {}
+    
+    @classmethod
+    def build(cls, location: Union[str, IResourceSource]) -> 'ProjectIndex':
+        """Percorre a fonte uma única vez e monta o índice"""
+        index = cls(as_source(location))
+        root = os.path.normpath(index.root)
+        
+        for dirpath, dirnames, filenames in index.source.walk(index.root):
+            directory = os.path.normpath(dirpath)
+            index.directories.add(directory)
+            index._files_under.setdefault(directory, [])
+            index._images_under.setdefault(directory, [])
+            if directory == root:
+                index.top_level_directories = list(dirnames)
+            
+            ancestors = index._ancestors(directory, root)
+            role = index._role_for(directory, root)
+            for filename in filenames:
+                path = os.path.join(dirpath, filename)
+                normalized = os.path.normpath(path)
+                index.files.append(path)
+                index.paths.add(normalized)
+                index.by_basename.setdefault(filename, []).append(path)
+                index.by_role.setdefault(role, []).append(path)
+                
+                is_image = os.path.splitext(filename)[1].lower() in cls.IMAGE_EXTENSIONS
+                if filename.endswith('.json'):
+                    index.json_files.append(path)
+                if is_image:
+                    index.image_files.append(path)
+                for ancestor in ancestors:
+                    index._files_under[ancestor].append(path)
+                    if is_image:
+                        index._images_under[ancestor].append(normalized)
+        
+        return index
+    
+    @staticmethod
+    def folder_role(name: str) -> Optional[str]:
+        """Classifica uma pasta de primeiro nível pelo nome ('artwork', 'resources', 'graphics')"""
+        name_lower = name.lower()
+        if 'artwork' in name_lower or 'artboards' in name_lower:
+            return 'artwork'
+        elif 'resources' in name_lower:
+            return 'resources'
+        elif 'graphics' in name_lower:
+            return 'graphics'
+        return None
+    
+    def _role_for(self, directory: str, root: str) -> str:
+        """Papel da pasta de primeiro nível que contém o diretório"""
+        if directory == root:
+            return 'root'
+        top_level = os.path.relpath(directory, root).split(os.sep)[0]
+        return self.folder_role(top_level) or 'other'
+    
+    @staticmethod
+    def _ancestors(directory: str, root: str) -> List[str]:
+        """Diretório e todos os seus ancestrais até a raiz"""
+        ancestors = [directory]
+        current = directory
+        while current != root:
+            parent = os.path.dirname(current)
+            if parent == current:
+                break
+            current = parent
+            ancestors.append(current)
+        return ancestors
+    
+    def exists(self, path: str) -> bool:
+        """Verifica se o caminho existe no projeto (arquivo ou pasta), sem acessar o disco"""
+        normalized = os.path.normpath(path)
+        return normalized in self.paths or normalized in self.directories
+    
+    def files_under(self, directory: str) -> List[str]:
+        """Arquivos contidos (recursivamente) em um diretório, na ordem da varredura"""
+        return self._files_under.get(os.path.normpath(directory), [])
+    
+    def images_under(self, directory: str) -> List[str]:
+        """Imagens contidas (recursivamente) em um diretório, com caminhos normalizados"""
+        return self._images_under.get(os.path.normpath(directory), [])
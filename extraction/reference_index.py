@@ -0,0 +1,73 @@
+"""Índice de referências dos artboards (SRP)"""
+import os
+from typing import Any, Dict, Iterable, List, Optional, Set, Union
+
+
+class ReferenceIndex:
+    """Reúne, em uma única passada, todas as strings referenciadas pelos artboards (Single Responsibility)
+    
+    Responde se uma imagem já está referenciada com a mesma semântica da busca
+    recursiva original (o nome ou o caminho da imagem contido em algum valor
+    string dos dados), mas com consultas a conjuntos e uma única busca de
+    substring em C em vez de percorrer as árvores a cada imagem.
+    """
+    
+    ARTBOARD_TYPES = ('artboard_json', 'artboard_manifest')
+    # Separador que não pode aparecer em caminhos: evita coincidências entre valores vizinhos
+    SEPARATOR = '\0'
+    
+    def __init__(self, base_directory: Optional[str] = None):
+        self.base_directory = base_directory
+        self.strings: Set[str] = set()
+        self.basenames: Set[str] = set()
+        self.resolved_paths: Set[str] = set()
+        self._joined: Optional[str] = None
+    
+    @classmethod
+    def from_items(cls, content_items: Iterable[Union[str, Dict[str, Any]]],
+                   base_directory: Optional[str] = None) -> 'ReferenceIndex':
+        """Monta o índice a partir das entradas de artboard do conteúdo extraído"""
+        index = cls(base_directory)
+        for item in content_items:
+            if isinstance(item, dict) and item.get('type') in cls.ARTBOARD_TYPES:
+                index.add_tree(item.get('data', {}))
+        return index
+    
+    def add_tree(self, data: Any):
+        """Coleta os valores string (de dicionários) de uma árvore JSON"""
+        pending: List[Any] = [data]
+        while pending:
+            node = pending.pop()
+            if isinstance(node, dict):
+                for value in node.values():
+                    if isinstance(value, str):
+                        self._add_string(value)
+                    elif isinstance(value, (dict, list)):
+                        pending.append(value)
+            elif isinstance(node, list):
+                pending.extend(item for item in node if isinstance(item, (dict, list)))
+    
+    def _add_string(self, value: str):
+        if value in self.strings:
+            return
+        self.strings.add(value)
+        self.basenames.add(os.path.basename(value))
+        if self.base_directory:
+            self.resolved_paths.add(os.path.normpath(os.path.join(self.base_directory, value)))
+        self._joined = None
+    
+    def is_referenced(self, image_path: str) -> bool:
+        """Verifica se a imagem (nome ou caminho) aparece em algum valor referenciado"""
+        if not self.strings:
+            return False
+        
+        image_name = os.path.basename(image_path)
+        # Acertos exatos: consultas O(1)
+        if (image_path in self.strings or image_name in self.basenames or
+                os.path.normpath(image_path) in self.resolved_paths):
+            return True
+        
+        # Caminhos embutidos em strings maiores: mesma semântica de substring
+        if self._joined is None:
+            self._joined = self.SEPARATOR.join(self.strings)
+        return image_name in self._joined or image_path in self._joined
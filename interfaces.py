@@ -1,15 +1,41 @@
 """Interfaces abstratas para o visualizador XD (DIP + ISP)"""
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any, Union, Optional
+from typing import List, Dict, Any, Union, Optional, Iterator, Tuple, BinaryIO, Callable
 
 
 class IContentExtractor(ABC):
     """Interface para extração de conteúdo de arquivos .xd"""
     
     @abstractmethod
-    def extract_content(self, xd_file_path: str) -> List[Union[str, Dict[str, Any]]]:
+    def extract_content(self, xd_file_path: str,
+                        progress: Optional[Callable[[str, int, int], None]] = None,
+                        on_item: Optional[Callable[[Union[str, Dict[str, Any]], Any], None]] = None
+                        ) -> List[Union[str, Dict[str, Any]]]:
         """Extrai conteúdo visual do arquivo .xd (imagens e artboards JSON)"""
         pass
+    
+    @abstractmethod
+    def open_archive(self, xd_file_path: str) -> 'IResourceSource':
+        """Abre o arquivo .xd sem torná-lo o documento atual"""
+        pass
+    
+    @abstractmethod
+    def extract_from_archive(self, archive: 'IResourceSource',
+                             progress: Optional[Callable[[str, int, int], None]] = None,
+                             on_item: Optional[Callable[[Union[str, Dict[str, Any]], Any], None]] = None
+                             ) -> List[Union[str, Dict[str, Any]]]:
+        """Extrai o conteúdo visual de um arquivo aberto por open_archive"""
+        pass
+    
+    @abstractmethod
+    def set_archive(self, archive: 'IResourceSource'):
+        """Torna o arquivo o documento atual, fechando o anterior"""
+        pass
+    
+    @abstractmethod
+    def close_archive(self, archive: Optional['IResourceSource']):
+        """Fecha um arquivo aberto por open_archive que não se tornou o documento atual"""
+        pass
 
 
 class IDisplayRenderer(ABC):
@@ -40,7 +66,42 @@ class IProjectParser(ABC):
     """Interface para parsing de estrutura de projetos"""
     
     @abstractmethod
-    def parse_structure(self, directory: str) -> Dict[str, Any]:
+    def parse_structure(self, directory: Union[str, 'IResourceSource']) -> Dict[str, Any]:
         """Analisa estrutura do projeto"""
         pass
 
+
+class IResourceSource(ABC):
+    """Interface para acesso aos arquivos de um projeto (diretório ou arquivo .xd)"""
+    
+    root: str
+    
+    @abstractmethod
+    def exists(self, path: str) -> bool:
+        """Verifica se o caminho existe (arquivo ou pasta)"""
+        pass
+    
+    @abstractmethod
+    def isdir(self, path: str) -> bool:
+        """Verifica se o caminho é uma pasta"""
+        pass
+    
+    @abstractmethod
+    def listdir(self, path: str) -> List[str]:
+        """Lista os nomes contidos em uma pasta"""
+        pass
+    
+    @abstractmethod
+    def walk(self, top: str) -> Iterator[Tuple[str, List[str], List[str]]]:
+        """Percorre a árvore de pastas (mesmo formato de os.walk)"""
+        pass
+    
+    @abstractmethod
+    def open(self, path: str) -> BinaryIO:
+        """Abre um arquivo em modo binário"""
+        pass
+    
+    @abstractmethod
+    def content_key(self, path: str) -> str:
+        """Identificador do conteúdo de um arquivo (ou da pasta inteira); muda quando o conteúdo muda"""
+        pass
@@ -12,8 +12,8 @@ except ImportError:
 # Imports dos módulos
 from interfaces import IContentExtractor, IDisplayRenderer
 from extraction import XDStructureAnalyzer, ArtboardExtractor, XDContentExtractor
-from display import DisplayState, ImageDisplayController, CanvasRenderer
-from ui import SidebarManager, DragDropHandler
+from display import DisplayState, ImageDisplayController, CanvasRenderer, RenderScheduler, DiskCache
+from ui import SidebarManager, DragDropHandler, DocumentLoader
 
 
 class XDViewer(TkinterDnD.Tk if TkinterDnD else tk.Tk):
@@ -31,9 +31,12 @@ class XDViewer(TkinterDnD.Tk if TkinterDnD else tk.Tk):
         self.content_extractor: IContentExtractor = XDContentExtractor(artboard_extractor)
         self.drag_handler = DragDropHandler(self)
         
+        # Cache persistente de miniaturas e artboards renderizados
+        self.disk_cache = DiskCache()
+        
         # Estado de exibição
         self.display_state = DisplayState()
-        self.display_controller = ImageDisplayController(self.display_state)
+        self.display_controller = ImageDisplayController(self.display_state, self.disk_cache)
         
         # Estado
         self.all_content: List[str] = []
@@ -50,9 +53,21 @@ class XDViewer(TkinterDnD.Tk if TkinterDnD else tk.Tk):
             self.display_state,
             self.display_controller
         )
+        self.render_scheduler = RenderScheduler(self.canvas, self.renderer)
         
         # Sidebar
-        self.sidebar_manager = SidebarManager(self.sidebar_frame, self.on_content_selected)
+        self.sidebar_manager = SidebarManager(self.sidebar_frame, self.on_content_selected, disk_cache=self.disk_cache)
+        
+        # Carregamento em segundo plano
+        self.document_loader = DocumentLoader(
+            self,
+            self.content_extractor,
+            on_progress=self.on_load_progress,
+            on_item=self.on_load_item,
+            on_done=self.on_load_done,
+            on_error=self.on_load_error
+        )
+        self._loading_started_items = False
         
         # Setup
         self.setup_drag_and_drop()
@@ -73,6 +88,9 @@ class XDViewer(TkinterDnD.Tk if TkinterDnD else tk.Tk):
     
     def create_layout(self):
         """Cria o layout principal"""
+        self.status_label = tk.Label(self, text="", anchor=tk.W, bg="gray15", fg="gray70", font=("Arial", 9))
+        self.status_label.pack(side=tk.BOTTOM, fill=tk.X)
+        
         self.main_paned = tk.PanedWindow(self, orient=tk.HORIZONTAL, sashwidth=5, sashrelief=tk.RAISED)
         self.main_paned.pack(fill=tk.BOTH, expand=True)
         
@@ -113,7 +131,7 @@ class XDViewer(TkinterDnD.Tk if TkinterDnD else tk.Tk):
         self.canvas.bind("<ButtonPress-1>", self.on_drag_start)
         self.canvas.bind("<B1-Motion>", self.on_drag)
         self.canvas.bind("<ButtonRelease-1>", self.on_drag_end)
-        self.canvas.bind("<Configure>", lambda e: self.renderer.render())
+        self.canvas.bind("<Configure>", lambda e: self.render_scheduler.request_render())
     
     def on_file_drop(self, event):
         """Handler para drag-and-drop"""
@@ -151,40 +169,92 @@ class XDViewer(TkinterDnD.Tk if TkinterDnD else tk.Tk):
             self.process_xd_file(file_path)
     
     def process_xd_file(self, file_path: str):
-        """Processa arquivo .xd usando extrator (DIP)"""
+        """Processa arquivo .xd em segundo plano (cancela um carregamento em andamento)"""
+        # Um carregamento cancelado pode ter deixado o sidebar com itens parciais
+        self._restore_sidebar()
+        self.status_label.config(text=f"Carregando {os.path.basename(file_path)}...")
+        self.document_loader.load(file_path)
+    
+    def on_load_progress(self, stage: str, done: int, total: int):
+        """Exibe a etapa atual do carregamento"""
+        label = DocumentLoader.STAGE_LABELS.get(stage, stage)
+        if total:
+            label = f"{label} ({done}/{total})"
+        self.status_label.config(text=f"{label}...")
+    
+    def on_load_item(self, item, resources):
+        """Adiciona ao sidebar cada item descoberto durante o carregamento"""
+        if not self._loading_started_items:
+            self._loading_started_items = True
+            self.sidebar_manager.begin_content(resources)
+        self.sidebar_manager.append_content(item)
+    
+    def on_load_done(self, content, resources):
+        """Troca o documento exibido pelo recém-carregado (no loop do Tk)"""
+        self._loading_started_items = False
         try:
-            # Usa interface IContentExtractor (DIP)
-            self.all_content = self.content_extractor.extract_content(file_path)
+            self.all_content = content
             self.selected_content_index = 0
+            self._reset_drag()
             
-            # Obter diretório base temporário do extrator
-            base_directory = None
-            if isinstance(self.content_extractor, XDContentExtractor):
-                base_directory = self.content_extractor.get_temp_dir()
+            # Trocar o arquivo do controlador e do extrator (que fecha o anterior) no loop do Tk
+            self.display_controller.resources = resources
+            self.content_extractor.set_archive(resources)
+            base_directory = resources.root
+            
+            if len(self.sidebar_manager.content_items) != len(self.all_content):
+                self.sidebar_manager.update_content(self.all_content, 0, resources)
             
-            self.sidebar_manager.update_content(self.all_content, 0)
             if self.all_content:
+                self.on_load_progress('render', 0, 0)
+                self.update_idletasks()
                 # Usa interface IDisplayRenderer (DIP)
+                self.render_scheduler.cancel()
                 self.renderer.load_content(self.all_content[0], base_directory)
+                self.display_controller.prefetch_neighbours(self.all_content, 0, base_directory)
         except Exception as e:
             messagebox.showerror("Erro", f"Erro ao processar arquivo .xd:\n{str(e)}")
+        finally:
+            self.status_label.config(text="")
+    
+    def on_load_error(self, error: Exception):
+        """Informa falha no carregamento e volta o sidebar para o documento atual"""
+        self._restore_sidebar()
+        self.status_label.config(text="")
+        messagebox.showerror("Erro", f"Erro ao processar arquivo .xd:\n{str(error)}")
+    
+    def _restore_sidebar(self):
+        """Desfaz os itens parciais de um carregamento que não terminou"""
+        if not self._loading_started_items:
+            return
+        self._loading_started_items = False
+        self.sidebar_manager.update_content(self.all_content, self.selected_content_index,
+                                            self.display_controller.resources)
     
     def on_content_selected(self, index: int):
         """Callback quando conteúdo é selecionado no sidebar"""
         if 0 <= index < len(self.all_content):
             self.selected_content_index = index
-            self.sidebar_manager.update_content(self.all_content, index)
+            self._reset_drag()
+            self.sidebar_manager.set_selected(index)
             
-            # Obter diretório base temporário do extrator
+            # Obter raiz do arquivo aberto
             base_directory = None
             if isinstance(self.content_extractor, XDContentExtractor):
-                base_directory = self.content_extractor.get_temp_dir()
+                base_directory = self.content_extractor.get_base_directory()
             
-            self.renderer.load_content(self.all_content[index], base_directory)
+            self.render_scheduler.cancel()
+            try:
+                self.renderer.load_content(self.all_content[index], base_directory)
+            except Exception as e:
+                messagebox.showerror("Erro", f"Erro ao exibir conteúdo:\n{str(e)}")
+                return
+            # Preparar os itens vizinhos enquanto o atual é exibido
+            self.display_controller.prefetch_neighbours(self.all_content, index, base_directory)
     
     def on_zoom(self, event):
         """Handle zoom"""
-        self.renderer.zoom(event, event.delta)
+        self.render_scheduler.request_zoom(event)
     
     def on_drag_start(self, event):
         """Inicia arrastar"""
@@ -201,17 +271,28 @@ class XDViewer(TkinterDnD.Tk if TkinterDnD else tk.Tk):
             return
         delta_x = event.x - self.drag_data["x"]
         delta_y = event.y - self.drag_data["y"]
-        self.renderer.pan(delta_x, delta_y)
+        if delta_x == 0 and delta_y == 0:
+            return
+        self.render_scheduler.request_pan(delta_x, delta_y)
         self.drag_data["x"] = event.x
         self.drag_data["y"] = event.y
     
     def on_drag_end(self, event):
         """Finaliza arrastar"""
+        self._reset_drag()
+    
+    def _reset_drag(self):
+        """Reseta estado de arraste (ex.: ao trocar de conteúdo no meio de um arraste)"""
+        self.drag_data["x"] = 0
+        self.drag_data["y"] = 0
         self.drag_data["active"] = False
         self.canvas.config(cursor="hand2")
     
     def on_closing(self):
         """Cleanup ao fechar"""
+        self.document_loader.close()
+        self.sidebar_manager.close()
+        self.display_controller.close()
         if isinstance(self.content_extractor, XDContentExtractor):
             self.content_extractor.cleanup()
         self.destroy()
@@ -1,6 +1,18 @@
 """Módulo de interface do usuário"""
-from .sidebar import SidebarManager
 from .drag_drop import DragDropHandler
+from .document_loader import DocumentLoader, LoadCancelled
+from .thumbnails import ThumbnailGenerator, make_thumbnail
 
-__all__ = ['SidebarManager', 'DragDropHandler']
+__all__ = ['SidebarManager', 'DragDropHandler', 'DocumentLoader', 'LoadCancelled', 'ThumbnailGenerator', 'make_thumbnail']
 
+# Componentes do Tk importados sob demanda: miniaturas e carregamento funcionam sem tkinter
+_LAZY = {'SidebarManager': '.sidebar'}
+
+
+def __getattr__(name):
+    if name in _LAZY:
+        import importlib
+        value = getattr(importlib.import_module(_LAZY[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
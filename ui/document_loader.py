@@ -0,0 +1,165 @@
+"""Carregamento de documentos em segundo plano (SRP)"""
+import queue
+import threading
+import time
+from typing import Any, Callable, List, Optional
+from interfaces import IContentExtractor
+
+
+class LoadCancelled(Exception):
+    """Sinaliza que o carregamento em andamento foi cancelado"""
+
+
+class DocumentLoader:
+    """Executa a extração em uma thread e entrega progresso e resultados no loop do Tk (Single Responsibility)
+    
+    A thread de trabalho nunca toca no Tk: as mensagens são enfileiradas e
+    despachadas no loop principal via after(). Cada carregamento recebe uma
+    geração; mensagens de gerações anteriores (canceladas) são descartadas.
+    
+    A thread só abre o novo arquivo: ele passa a ser o documento atual em
+    on_done(content, archive), no loop do Tk. Arquivos de carregamentos que
+    falharam, foram cancelados ou ficaram obsoletos também são fechados no
+    loop do Tk, pois os itens já entregues a on_item podem estar em uso.
+    """
+    
+    STAGE_LABELS = {
+        'unzip': "Abrindo arquivo",
+        'index': "Indexando arquivos",
+        'parse': "Lendo artboards",
+        'render': "Renderizando"
+    }
+    
+    def __init__(self, tk_root, content_extractor: IContentExtractor,
+                 on_progress: Callable[[str, int, int], None],
+                 on_item: Callable[[Any, Any], None],
+                 on_done: Callable[[Any, Any], None],
+                 on_error: Callable[[Exception], None],
+                 poll_ms: int = 30, progress_interval: float = 0.1):
+        self.tk_root = tk_root
+        self.content_extractor = content_extractor
+        self.on_progress = on_progress
+        self.on_item = on_item
+        self.on_done = on_done
+        self.on_error = on_error
+        self.poll_ms = poll_ms
+        self.progress_interval = progress_interval
+        self._queue: "queue.Queue" = queue.Queue()
+        # Extrações são serializadas: uma nova espera a anterior abortar
+        self._extract_lock = threading.Lock()
+        self._generation = 0
+        self._cancel_event: Optional[threading.Event] = None
+        self._poll_job: Optional[str] = None
+        self._workers: List[threading.Thread] = []
+    
+    @property
+    def loading(self) -> bool:
+        """Indica se há um carregamento em andamento"""
+        return self._cancel_event is not None and not self._cancel_event.is_set()
+    
+    def load(self, file_path: str):
+        """Inicia o carregamento de um arquivo, cancelando o anterior"""
+        self.cancel()
+        self._generation += 1
+        self._cancel_event = threading.Event()
+        worker = threading.Thread(
+            target=self._run,
+            args=(self._generation, file_path, self._cancel_event),
+            daemon=True
+        )
+        worker.start()
+        self._workers.append(worker)
+        self._ensure_polling()
+    
+    def cancel(self):
+        """Cancela o carregamento em andamento (se houver)"""
+        if self._cancel_event is not None:
+            self._cancel_event.set()
+    
+    def _run(self, generation: int, file_path: str, cancel_event: threading.Event):
+        """Executado na thread de trabalho"""
+        last_post = [None, 0.0]
+        
+        def progress(stage: str, done: int, total: int):
+            if cancel_event.is_set():
+                raise LoadCancelled()
+            # Limita a quantidade de mensagens enviadas ao loop do Tk
+            now = time.monotonic()
+            if stage != last_post[0] or now - last_post[1] >= self.progress_interval:
+                last_post[0], last_post[1] = stage, now
+                self._queue.put((generation, 'progress', (stage, done, total)))
+        
+        def on_item(item, resources):
+            if cancel_event.is_set():
+                raise LoadCancelled()
+            self._queue.put((generation, 'item', (item, resources)))
+        
+        with self._extract_lock:
+            if cancel_event.is_set():
+                return
+            archive = None
+            try:
+                progress('unzip', 0, 0)
+                archive = self.content_extractor.open_archive(file_path)
+                content = self.content_extractor.extract_from_archive(archive, progress, on_item)
+            except LoadCancelled:
+                self._queue.put((generation, 'cancelled', archive))
+            except Exception as e:
+                self._queue.put((generation, 'error', (e, archive)))
+            else:
+                self._queue.put((generation, 'done', (content, archive)))
+    
+    def _ensure_polling(self):
+        if self._poll_job is None:
+            self._poll_job = self.tk_root.after(self.poll_ms, self._poll)
+    
+    def _poll(self):
+        """Despacha as mensagens pendentes no loop do Tk"""
+        self._poll_job = None
+        while True:
+            try:
+                generation, kind, payload = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if generation != self._generation or kind == 'cancelled':
+                self._discard(kind, payload)
+                continue
+            if kind == 'progress':
+                self.on_progress(*payload)
+            elif kind == 'item':
+                self.on_item(*payload)
+            elif kind == 'done':
+                self._cancel_event = None
+                self.on_done(*payload)
+            elif kind == 'error':
+                self._cancel_event = None
+                error, archive = payload
+                try:
+                    self.on_error(error)
+                finally:
+                    self.content_extractor.close_archive(archive)
+        
+        # Continua enquanto houver threads que ainda podem enviar arquivos a fechar
+        self._workers = [worker for worker in self._workers if worker.is_alive()]
+        if self.loading or self._workers or not self._queue.empty():
+            self._ensure_polling()
+    
+    def _discard(self, kind: str, payload: Any):
+        """Fecha o arquivo de uma mensagem final que não será entregue"""
+        if kind == 'cancelled':
+            self.content_extractor.close_archive(payload)
+        elif kind in ('done', 'error'):
+            self.content_extractor.close_archive(payload[1])
+    
+    def close(self):
+        """Cancela o carregamento e fecha os arquivos de mensagens ainda não despachadas"""
+        self.cancel()
+        if self._poll_job is not None:
+            self.tk_root.after_cancel(self._poll_job)
+            self._poll_job = None
+        while True:
+            try:
+                _, kind, payload = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            self._discard(kind, payload)
@@ -3,18 +3,79 @@ import tkinter as tk
 import os
 from typing import List, Optional, Union, Dict, Any
 from PIL import Image, ImageTk
+from interfaces import IResourceSource
+from display.lru import LRUCache
+from display.disk_cache import DiskCache, artboard_content_key
+from .thumbnails import ThumbnailGenerator
+
+
+class _SidebarRow:
+    """Linha reutilizável do sidebar: widgets criados uma vez e religados a itens diferentes"""
+    
+    def __init__(self, canvas: tk.Canvas, height: int):
+        self.index = -1
+        self.frame = tk.Frame(canvas, bg="gray15", relief=tk.RAISED, borderwidth=1, height=height)
+        self.frame.pack_propagate(False)
+        
+        self.thumb_label = tk.Label(self.frame, bg="gray15", cursor="hand2")
+        self.thumb_label.pack(pady=5)
+        
+        self.type_label = tk.Label(self.frame, bg="gray15", font=("Arial", 7), cursor="hand2")
+        self.type_label.pack()
+        
+        self.name_label = tk.Label(
+            self.frame,
+            bg="gray15",
+            fg="white",
+            font=("Arial", 9),
+            cursor="hand2",
+            wraplength=250
+        )
+        self.name_label.pack(pady=(0, 5))
+        
+        self.window_id = canvas.create_window(0, 0, window=self.frame, anchor="nw", height=height)
+    
+    @property
+    def widgets(self) -> List[tk.Widget]:
+        return [self.frame, self.thumb_label, self.type_label, self.name_label]
+    
+    def set_background(self, color: str):
+        for widget in self.widgets:
+            widget.config(bg=color)
 
 
 class SidebarManager:
-    """Responsável por gerenciar o painel lateral (Single Responsibility)"""
+    """Responsável por gerenciar o painel lateral (Single Responsibility)
+    
+    A lista é virtualizada: todas as linhas têm altura fixa e apenas as visíveis
+    existem como widgets. Um pequeno conjunto de linhas é reaproveitado durante
+    a rolagem, de modo que o custo não cresce com a quantidade de itens.
+    Miniaturas de imagens e artboards são geradas em segundo plano: as linhas
+    mostram um placeholder até a miniatura ficar pronta, e as visíveis têm prioridade.
+    """
     
-    def __init__(self, parent_frame: tk.Frame, on_content_selected):
+    ROW_HEIGHT = 200
+    ROW_PADDING = 3
+    THUMBNAIL_SIZE = (150, 150)
+    THUMBNAIL_CACHE_ITEMS = 256
+    THUMBNAIL_POLL_MS = 30
+    
+    def __init__(self, parent_frame: tk.Frame, on_content_selected,
+                 thumbnail_generator: Optional[ThumbnailGenerator] = None,
+                 disk_cache: Optional[DiskCache] = None):
         self.parent_frame = parent_frame
         self.on_content_selected = on_content_selected
-        self.scrollable_frame: Optional[tk.Frame] = None
         self.sidebar_canvas: Optional[tk.Canvas] = None
+        self.scrollbar: Optional[tk.Scrollbar] = None
         self.selected_index = -1
-        self.items = []
+        self.content_items: List[Union[str, Dict[str, Any]]] = []
+        self.resources: Optional[IResourceSource] = None
+        self.rows: List[_SidebarRow] = []
+        self.thumbnails = LRUCache(max_items=self.THUMBNAIL_CACHE_ITEMS)
+        self.thumbnail_generator = thumbnail_generator or ThumbnailGenerator(self.THUMBNAIL_SIZE, disk_cache=disk_cache)
+        self._placeholder: Optional[ImageTk.PhotoImage] = None
+        self._thumbnail_job: Optional[str] = None
+        self._empty_window: Optional[int] = None
         self._create_ui()
     
     def _create_ui(self):
@@ -33,167 +94,279 @@ class SidebarManager:
         scroll_frame.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
         
         self.sidebar_canvas = tk.Canvas(scroll_frame, bg="gray15", highlightthickness=0)
-        scrollbar = tk.Scrollbar(scroll_frame, orient=tk.VERTICAL, command=self.sidebar_canvas.yview)
-        self.scrollable_frame = tk.Frame(self.sidebar_canvas, bg="gray15")
-        
-        self.scrollable_frame.bind(
-            "<Configure>",
-            lambda e: self.sidebar_canvas.configure(scrollregion=self.sidebar_canvas.bbox("all"))
-        )
-        
-        self.sidebar_canvas.create_window((0, 0), window=self.scrollable_frame, anchor="nw")
-        self.sidebar_canvas.configure(yscrollcommand=scrollbar.set)
+        self.scrollbar = tk.Scrollbar(scroll_frame, orient=tk.VERTICAL, command=self._on_scrollbar)
+        self.sidebar_canvas.configure(yscrollcommand=self.scrollbar.set)
         
         self.sidebar_canvas.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
         self.sidebar_canvas.bind("<MouseWheel>", self._on_scroll)
+        self.sidebar_canvas.bind("<Configure>", self._on_configure)
         
+        empty_label = tk.Label(
+            self.sidebar_canvas,
+            text="Nenhum projeto carregado",
+            bg="gray15",
+            fg="gray60",
+            font=("Arial", 10),
+            pady=20
+        )
+        self._empty_window = self.sidebar_canvas.create_window(0, 0, window=empty_label, anchor="nw")
         self._show_empty_message()
     
+    def _on_scrollbar(self, *args):
+        """Rolagem pela barra lateral"""
+        self.sidebar_canvas.yview(*args)
+        self._refresh_rows()
+    
     def _on_scroll(self, event):
         """Handle scroll no painel lateral"""
         self.sidebar_canvas.yview_scroll(int(-1 * (event.delta / 120)), "units")
+        self._refresh_rows()
+    
+    def _on_configure(self, event):
+        """Ajusta largura das linhas e quantidade de linhas visíveis ao redimensionar"""
+        width = self._row_width()
+        for row in self.rows:
+            self.sidebar_canvas.itemconfigure(row.window_id, width=width)
+        self._update_scrollregion()
+        self._refresh_rows()
     
     def _show_empty_message(self):
         """Mostra mensagem quando não há conteúdo"""
-        label = tk.Label(
-            self.scrollable_frame,
-            text="Nenhum projeto carregado",
-            bg="gray15",
-            fg="gray60",
-            font=("Arial", 10),
-            pady=20
-        )
-        label.pack()
+        for row in self.rows:
+            self._hide_row(row)
+        self.sidebar_canvas.itemconfigure(self._empty_window, state="normal")
+        self.sidebar_canvas.coords(self._empty_window, max(0, (self._row_width() - 160) // 2), 0)
+        self.sidebar_canvas.configure(scrollregion=(0, 0, 0, 0))
     
-    def update_content(self, content_items: List[Union[str, Dict[str, Any]]], selected_index: int = 0):
+    def update_content(self, content_items: List[Union[str, Dict[str, Any]]], selected_index: int = 0,
+                       resources: Optional[IResourceSource] = None):
         """Atualiza a lista de conteúdo no sidebar"""
-        for widget in self.scrollable_frame.winfo_children():
-            widget.destroy()
-        self.items = []
-        
-        if not content_items:
+        if resources is not None:
+            self.resources = resources
+        content_items = list(content_items)
+        if content_items and content_items == self.content_items:
+            # Mesma lista: mantém miniaturas e posição de rolagem
+            self.set_selected(selected_index)
+            return
+        self.content_items = content_items
+        self.selected_index = selected_index
+        self._reset_rows()
+    
+    def set_selected(self, index: int):
+        """Altera o item selecionado restilizando apenas as linhas afetadas (mantém rolagem e miniaturas)"""
+        previous = self.selected_index
+        if index == previous:
+            return
+        self.selected_index = index
+        for row in self.rows:
+            if row.index == previous:
+                row.set_background("gray15")
+            elif row.index == index:
+                row.set_background("gray20")
+    
+    def begin_content(self, resources: Optional[IResourceSource] = None, selected_index: int = 0):
+        """Limpa o sidebar para receber itens incrementalmente (ex.: durante o carregamento)"""
+        self.content_items = []
+        self.resources = resources
+        self.selected_index = selected_index
+        self._reset_rows()
+    
+    def append_content(self, content_item: Union[str, Dict[str, Any]]):
+        """Adiciona um item ao final da lista"""
+        self.content_items.append(content_item)
+        if len(self.content_items) == 1:
+            self.sidebar_canvas.itemconfigure(self._empty_window, state="hidden")
+        self._update_scrollregion()
+        first, last = self._visible_range()
+        if first <= len(self.content_items) - 1 < last:
+            self._refresh_rows()
+    
+    def _reset_rows(self):
+        """Descarta miniaturas e vínculos das linhas e volta ao topo da lista"""
+        self.thumbnails.clear()
+        self.thumbnail_generator.reset()
+        for row in self.rows:
+            row.index = -1
+        self.sidebar_canvas.yview_moveto(0)
+        if not self.content_items:
             self._show_empty_message()
             return
+        self.sidebar_canvas.itemconfigure(self._empty_window, state="hidden")
+        self._update_scrollregion()
+        self._refresh_rows()
+    
+    def _row_width(self) -> int:
+        return max(1, self.sidebar_canvas.winfo_width() - 2 * 5)
+    
+    def _update_scrollregion(self):
+        height = len(self.content_items) * self.ROW_HEIGHT
+        self.sidebar_canvas.configure(scrollregion=(0, 0, self._row_width(), height))
+    
+    def _visible_range(self):
+        """Intervalo [first, last) de índices de itens visíveis no viewport"""
+        top = self.sidebar_canvas.canvasy(0)
+        height = max(self.sidebar_canvas.winfo_height(), self.ROW_HEIGHT)
+        first = max(0, int(top // self.ROW_HEIGHT))
+        last = min(len(self.content_items), int((top + height) // self.ROW_HEIGHT) + 1)
+        return first, max(first, last)
+    
+    def _refresh_rows(self):
+        """Liga as linhas do pool aos itens visíveis, reaproveitando as que já mostram o item certo"""
+        if not self.content_items:
+            return
+        first, last = self._visible_range()
+        visible = range(first, last)
         
-        self.selected_index = selected_index
+        while len(self.rows) < len(visible):
+            row = _SidebarRow(self.sidebar_canvas, self.ROW_HEIGHT - 2 * self.ROW_PADDING)
+            self.sidebar_canvas.itemconfigure(row.window_id, width=self._row_width())
+            self._bind_row_events(row)
+            self.rows.append(row)
         
-        for idx, content_item in enumerate(content_items):
-            self._create_item(idx, content_item)
-    
-    def _create_item(self, index: int, content_item: Union[str, Dict[str, Any]]):
-        """Cria um item no sidebar"""
-        is_selected = index == self.selected_index
-        item_frame = tk.Frame(
-            self.scrollable_frame,
-            bg="gray20" if is_selected else "gray15",
-            relief=tk.RAISED,
-            borderwidth=1
-        )
-        item_frame.pack(fill=tk.X, padx=5, pady=3)
+        # Linhas que já exibem um item visível permanecem como estão
+        bound = {row.index: row for row in self.rows if row.index in visible}
+        free = [row for row in self.rows if row.index not in visible]
+        for index in visible:
+            row = bound.get(index)
+            if row is None:
+                row = free.pop()
+                self._bind_row(row, index)
+            self.sidebar_canvas.itemconfigure(row.window_id, state="normal")
+        for row in free:
+            self._hide_row(row)
+        
+        self._request_thumbnails(first, last)
+    
+    def _hide_row(self, row: _SidebarRow):
+        row.index = -1
+        self.sidebar_canvas.itemconfigure(row.window_id, state="hidden")
+    
+    def _bind_row_events(self, row: _SidebarRow):
+        """Eventos ligados uma única vez por linha; o item é resolvido no momento do evento"""
+        for widget in row.widgets:
+            widget.bind("<Button-1>", lambda e, r=row: self._on_row_click(r))
+            widget.bind("<Enter>", lambda e, r=row: self._on_enter(e, r))
+            widget.bind("<Leave>", lambda e, r=row: self._on_leave(e, r))
+            widget.bind("<MouseWheel>", self._on_scroll)
+    
+    def _on_row_click(self, row: _SidebarRow):
+        if row.index >= 0:
+            self.on_content_selected(row.index)
+    
+    def _bind_row(self, row: _SidebarRow, index: int):
+        """Exibe o item indicado na linha"""
+        row.index = index
+        content_item = self.content_items[index]
         
         # Determinar nome e tipo do conteúdo
         if isinstance(content_item, dict):
             # É um artboard JSON
             content_name = content_item.get('name', 'Artboard')
             content_type = 'artboard'
-            content_path = content_item.get('path', '')
         else:
             # É uma imagem
             content_name = os.path.basename(content_item)
             content_type = 'image'
-            content_path = content_item
         
         # Truncar nome se muito longo
         if len(content_name) > 25:
             content_name = content_name[:22] + "..."
         
-        try:
-            # Tentar carregar thumbnail
-            if isinstance(content_item, dict):
-                # Para artboards, criar uma imagem placeholder ou tentar renderizar
-                # Por enquanto, usar um placeholder
-                img = Image.new('RGB', (150, 150), color=(50, 50, 50))
-                # Adicionar texto indicando que é um artboard
-                from PIL import ImageDraw, ImageFont
-                draw = ImageDraw.Draw(img)
-                try:
-                    font = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf", 12)
-                except:
-                    font = ImageFont.load_default()
-                draw.text((10, 60), "ARTBOARD", fill=(200, 200, 200), font=font)
-                draw.text((10, 80), content_name[:15], fill=(150, 150, 150), font=font)
-            else:
-                img = Image.open(content_item)
-            
-            img.thumbnail((150, 150), Image.Resampling.LANCZOS)
-            thumbnail = ImageTk.PhotoImage(img)
-            
-            thumb_label = tk.Label(
-                item_frame,
-                image=thumbnail,
-                bg=item_frame.cget("bg"),
-                cursor="hand2"
-            )
-            thumb_label.image = thumbnail
-            thumb_label.pack(pady=5)
-            
-            # Adicionar indicador de tipo
-            type_label = tk.Label(
-                item_frame,
+        thumbnail = self._get_thumbnail(index)
+        if thumbnail is not None:
+            row.thumb_label.config(image=thumbnail)
+            row.thumb_label.image = thumbnail
+            row.type_label.config(
                 text="[Artboard]" if content_type == 'artboard' else "[Imagem]",
-                bg=item_frame.cget("bg"),
-                fg="cyan" if content_type == 'artboard' else "yellow",
-                font=("Arial", 7),
-                cursor="hand2"
-            )
-            type_label.pack()
-            
-            name_label = tk.Label(
-                item_frame,
-                text=content_name,
-                bg=item_frame.cget("bg"),
-                fg="white",
-                font=("Arial", 9),
-                cursor="hand2",
-                wraplength=250
+                fg="cyan" if content_type == 'artboard' else "yellow"
             )
-            name_label.pack(pady=(0, 5))
-            
-            def on_click(event, idx=index):
-                self.on_content_selected(idx)
-            
-            for widget in [item_frame, thumb_label, type_label, name_label]:
-                widget.bind("<Button-1>", on_click)
-                if not is_selected:
-                    widget.bind("<Enter>", lambda e, f=item_frame: self._on_enter(e, f))
-                    widget.bind("<Leave>", lambda e, f=item_frame: self._on_leave(e, f))
+            row.name_label.config(text=content_name, fg="white")
+        else:
+            row.thumb_label.config(image="")
+            row.thumb_label.image = None
+            row.type_label.config(text="")
+            row.name_label.config(text=f"Erro: {content_name}", fg="red")
         
-        except Exception as e:
-            error_label = tk.Label(
-                item_frame,
-                text=f"Erro: {content_name}",
-                bg=item_frame.cget("bg"),
-                fg="red",
-                font=("Arial", 9),
-                cursor="hand2"
+        row.set_background("gray20" if index == self.selected_index else "gray15")
+        self.sidebar_canvas.coords(row.window_id, 5, index * self.ROW_HEIGHT + self.ROW_PADDING)
+    
+    def _get_thumbnail(self, index: int) -> Optional[ImageTk.PhotoImage]:
+        """Miniatura do item (em cache por índice); placeholder enquanto é gerada, None se falhou"""
+        if index in self.thumbnails:
+            return self.thumbnails.get(index)
+        self._request_thumbnail(index, 0)
+        return self._get_placeholder()
+    
+    def _get_placeholder(self) -> ImageTk.PhotoImage:
+        """Imagem exibida enquanto a miniatura é gerada"""
+        if self._placeholder is None:
+            self._placeholder = ImageTk.PhotoImage(Image.new('RGB', self.THUMBNAIL_SIZE, color=(40, 40, 40)))
+        return self._placeholder
+    
+    def _request_thumbnail(self, index: int, priority: int):
+        """Agenda a geração da miniatura de um item (imagem ou artboard)"""
+        content_item = self.content_items[index]
+        resources = self.resources
+        if isinstance(content_item, dict):
+            artboard_data = content_item.get('data', content_item)
+            member = content_item.get('path') if content_item.get('type') == 'artboard_json' else None
+            base_directory = resources.root if resources else os.path.dirname(content_item.get('path', ''))
+            self.thumbnail_generator.request_artboard(
+                index,
+                artboard_data,
+                base_directory,
+                resources,
+                priority,
+                (lambda: artboard_content_key(resources, artboard_data, member)) if resources else None,
+                member
             )
-            error_label.pack(pady=5)
-            error_label.bind("<Button-1>", lambda e, idx=index: self.on_content_selected(idx))
-        
-        self.items.append(item_frame)
+        else:
+            self.thumbnail_generator.request_image(
+                index,
+                lambda: resources.open(content_item) if resources else content_item,
+                priority,
+                (lambda: resources.content_key(content_item)) if resources else None
+            )
+        if self._thumbnail_job is None:
+            self._thumbnail_job = self.sidebar_canvas.after(self.THUMBNAIL_POLL_MS, self._on_thumbnails_ready)
     
-    def _on_enter(self, event, frame: tk.Frame):
+    def _request_thumbnails(self, first: int, last: int):
+        """Prioriza as linhas visíveis e antecipa uma página acima e abaixo; descarta o resto"""
+        page = max(1, last - first)
+        window = range(max(0, first - page), min(len(self.content_items), last + page))
+        for index in window:
+            if first <= index < last or index in self.thumbnails:
+                continue
+            distance = first - index if index < first else index - last + 1
+            self._request_thumbnail(index, distance)
+        self.thumbnail_generator.retain(window)
+    
+    def _on_thumbnails_ready(self):
+        """Recebe as miniaturas prontas (no loop do Tk) e atualiza as linhas que as exibem"""
+        self._thumbnail_job = None
+        for index, img, error in self.thumbnail_generator.poll():
+            thumbnail = ImageTk.PhotoImage(img) if img is not None else None
+            self.thumbnails.put(index, thumbnail)
+            for row in self.rows:
+                if row.index == index:
+                    self._bind_row(row, index)
+        if self.thumbnail_generator.busy:
+            self._thumbnail_job = self.sidebar_canvas.after(self.THUMBNAIL_POLL_MS, self._on_thumbnails_ready)
+    
+    def close(self):
+        """Interrompe a geração de miniaturas"""
+        if self._thumbnail_job is not None:
+            self.sidebar_canvas.after_cancel(self._thumbnail_job)
+            self._thumbnail_job = None
+        self.thumbnail_generator.shutdown()
+    
+    def _on_enter(self, event, row: _SidebarRow):
         """Hover effect - entrar"""
-        frame.config(bg="gray25")
-        for widget in frame.winfo_children():
-            if isinstance(widget, tk.Label):
-                widget.config(bg="gray25")
+        if row.index >= 0 and row.index != self.selected_index:
+            row.set_background("gray25")
     
-    def _on_leave(self, event, frame: tk.Frame):
+    def _on_leave(self, event, row: _SidebarRow):
         """Hover effect - sair"""
-        frame.config(bg="gray15")
-        for widget in frame.winfo_children():
-            if isinstance(widget, tk.Label):
-                widget.config(bg="gray15")
-
+        if row.index >= 0 and row.index != self.selected_index:
+            row.set_background("gray15")
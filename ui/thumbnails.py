@@ -0,0 +1,257 @@
+"""Geração assíncrona de miniaturas (SRP)"""
+import heapq
+import itertools
+import json
+import multiprocessing
+import os
+import queue
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, BinaryIO, Callable, Dict, Hashable, List, Optional, Tuple, Union
+from PIL import Image
+from interfaces import IResourceSource
+from extraction.archive import XDArchive, DirectorySource
+from display.disk_cache import DiskCache
+from display.artboard_renderer import ArtboardRenderer
+
+
+REDUCIBLE_MODES = {'L', 'LA', 'RGB', 'RGBA', 'I', 'F'}
+
+# Documento aberto em cada processo do pool: ((local, identidade), fonte, renderizador)
+_worker_document: Optional[Tuple[Tuple[str, Optional[str]], IResourceSource, ArtboardRenderer]] = None
+
+
+def make_thumbnail(source: Union[str, BinaryIO], size: Tuple[int, int]) -> Image.Image:
+    """Gera a miniatura decodificando o mínimo possível da imagem
+    
+    JPEGs são decodificados já reduzidos (draft); demais formatos são reduzidos
+    por fator inteiro com reduce() até ~2x o tamanho final, e só então
+    reamostrados com LANCZOS.
+    """
+    img = Image.open(source)
+    if img.format == 'JPEG':
+        img.draft('RGB', (size[0] * 2, size[1] * 2))
+    img.load()
+    
+    factor = min(img.width // (size[0] * 2), img.height // (size[1] * 2))
+    if factor > 1:
+        if img.mode not in REDUCIBLE_MODES:
+            img = img.convert('RGBA')
+        img = img.reduce(factor)
+    
+    img.thumbnail(size, Image.Resampling.LANCZOS)
+    return img
+
+
+def render_artboard_thumbnail(artboard_data: Dict[str, Any], base_directory: str,
+                              resources: Optional[IResourceSource], size: Tuple[int, int],
+                              renderer: Optional[ArtboardRenderer] = None) -> Image.Image:
+    """Renderiza o artboard diretamente na escala da miniatura"""
+    width = artboard_data.get('width', artboard_data.get('w', 800))
+    height = artboard_data.get('height', artboard_data.get('h', 600))
+    # Sem dimensões válidas não há o que reduzir (o renderizador gera uma imagem mínima)
+    scale = min(size[0] / width, size[1] / height, 1.0) if width > 0 and height > 0 else 1.0
+    renderer = renderer or ArtboardRenderer(base_directory, resources)
+    return renderer.render_artboard(artboard_data, width, height, scale)
+
+
+def _document_renderer(location: str, document_key: Optional[str]) -> Tuple[IResourceSource, ArtboardRenderer]:
+    """Fonte e renderizador do documento no processo do pool, abertos uma vez por documento
+    
+    Mantém só o último documento: ao mudar, o anterior é fechado (e seus bitmaps descartados).
+    """
+    global _worker_document
+    identity = (location, document_key)
+    if _worker_document is None or _worker_document[0] != identity:
+        if _worker_document is not None and isinstance(_worker_document[1], XDArchive):
+            _worker_document[1].close()
+        _worker_document = None  # não reaproveitar o anterior (fechado) se a abertura falhar
+        source = XDArchive(location) if os.path.isfile(location) else DirectorySource(location)
+        _worker_document = (identity, source, ArtboardRenderer(source.root, source))
+    return _worker_document[1], _worker_document[2]
+
+
+def _render_document_thumbnail(location: str, document_key: Optional[str], member: Optional[str],
+                               artboard_data: Optional[Dict[str, Any]], size: Tuple[int, int]) -> Image.Image:
+    """Renderiza a miniatura no pool de processos, lendo o JSON do artboard do próprio documento quando possível"""
+    source, renderer = _document_renderer(location, document_key)
+    if artboard_data is None:
+        with source.open(member) as f:
+            artboard_data = json.load(f)
+    return render_artboard_thumbnail(artboard_data, source.root, source, size, renderer)
+
+
+class ThumbnailGenerator:
+    """Gera miniaturas em um pool de threads limitado, por ordem de prioridade (Single Responsibility)
+    
+    Pedidos ficam em um heap (menor prioridade primeiro) e cada tarefa do pool
+    consome o pedido mais prioritário no momento em que é executada. Resultados
+    são entregues por poll(), que deve ser chamado pela thread da interface;
+    reset() descarta pedidos e resultados do documento anterior. Com um
+    DiskCache, miniaturas já geradas em execuções anteriores são reaproveitadas.
+    
+    Artboards são renderizados em um pool de processos (sem disputar o GIL com
+    o loop do Tk); a thread que atende o pedido apenas aguarda o resultado.
+    Cada processo abre o documento uma única vez e mantém seu renderizador;
+    para artboards lidos de um membro JSON, só o caminho do membro é enviado.
+    """
+    
+    def __init__(self, size: Tuple[int, int] = (150, 150), max_workers: Optional[int] = None,
+                 disk_cache: Optional[DiskCache] = None, process_workers: Optional[int] = None):
+        self.size = size
+        self.disk_cache = disk_cache
+        self.max_workers = max_workers or min(4, os.cpu_count() or 1)
+        self.process_workers = process_workers or os.cpu_count() or 1
+        # Threads suficientes para manter todos os processos ocupados e ainda decodificar imagens
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers + self.process_workers,
+                                            thread_name_prefix="thumbnail")
+        self._processes: Optional[ProcessPoolExecutor] = None
+        self._closed = False
+        self._heap: List[list] = []
+        self._pending: Dict[Hashable, list] = {}
+        self._results: "queue.Queue" = queue.Queue()
+        self._counter = itertools.count()
+        self._lock = threading.Lock()
+        self._generation = 0
+        self._running = 0
+    
+    @property
+    def busy(self) -> bool:
+        """Indica se há pedidos pendentes ou resultados ainda não entregues"""
+        with self._lock:
+            return bool(self._pending) or self._running > 0 or not self._results.empty()
+    
+    def request_image(self, key: Hashable, source: Callable[[], Union[str, BinaryIO]], priority: int = 0,
+                      content_key: Optional[Callable[[], str]] = None):
+        """Agenda a miniatura de uma imagem; se já pendente, apenas atualiza a prioridade quando maior
+        
+        content_key identifica o conteúdo de origem para o cache em disco.
+        """
+        self._request(key, lambda: make_thumbnail(source(), self.size), priority, content_key)
+    
+    def request_artboard(self, key: Hashable, artboard_data: Dict[str, Any], base_directory: str,
+                         resources: Optional[IResourceSource], priority: int = 0,
+                         content_key: Optional[Callable[[], str]] = None, member: Optional[str] = None):
+        """Agenda a miniatura de um artboard, renderizada no pool de processos
+        
+        member é o caminho do JSON do artboard no documento; sem ele (ex.: artboards
+        do manifest) os dados do artboard são enviados ao processo.
+        """
+        if isinstance(resources, XDArchive):
+            location = resources.xd_file_path
+        elif isinstance(resources, DirectorySource):
+            location = resources.root
+        else:
+            location, member = base_directory, None
+        data = None if member else artboard_data
+        
+        def job():
+            # Identidade do .xd (assinatura dos membros, calculada uma vez): reabre se o arquivo mudou
+            document_key = resources.content_key(resources.root) if isinstance(resources, XDArchive) else None
+            future = self._process_pool().submit(
+                _render_document_thumbnail, location, document_key, member, data, self.size
+            )
+            return future.result()
+        self._request(key, job, priority, content_key)
+    
+    def _request(self, key: Hashable, job: Callable[[], Image.Image], priority: int,
+                 content_key: Optional[Callable[[], str]]):
+        with self._lock:
+            entry = self._pending.get(key)
+            if entry is not None:
+                if priority >= entry[0]:
+                    return
+                entry[3] = None  # invalida a entrada anterior no heap
+            entry = [priority, next(self._counter), key, job, self._generation, content_key]
+            self._pending[key] = entry
+            heapq.heappush(self._heap, entry)
+        self._executor.submit(self._work)
+    
+    def retain(self, keys):
+        """Descarta pedidos pendentes que não estão em keys (ex.: fora da área visível)"""
+        keys = set(keys)
+        with self._lock:
+            for key in [k for k in self._pending if k not in keys]:
+                self._pending.pop(key)[3] = None
+    
+    def reset(self):
+        """Descarta todos os pedidos e resultados (ex.: ao trocar de documento)"""
+        with self._lock:
+            self._generation += 1
+            for entry in self._pending.values():
+                entry[3] = None
+            self._pending.clear()
+            self._heap.clear()
+    
+    def poll(self) -> List[Tuple[Hashable, Optional[Image.Image], Optional[Exception]]]:
+        """Retorna os resultados prontos como (key, imagem, erro)"""
+        ready = []
+        while True:
+            try:
+                generation, key, image, error = self._results.get_nowait()
+            except queue.Empty:
+                break
+            if generation == self._generation:
+                ready.append((key, image, error))
+        return ready
+    
+    def shutdown(self):
+        """Cancela pedidos pendentes e encerra o pool"""
+        self.reset()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        with self._lock:
+            self._closed = True
+            if self._processes is not None:
+                self._processes.shutdown(wait=False, cancel_futures=True)
+                self._processes = None
+    
+    def _process_pool(self) -> ProcessPoolExecutor:
+        """Cria o pool de processos no primeiro artboard (spawn: o processo principal tem threads do Tk)"""
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("Gerador de miniaturas encerrado")
+            if self._processes is None:
+                self._processes = ProcessPoolExecutor(
+                    max_workers=self.process_workers,
+                    mp_context=multiprocessing.get_context('spawn')
+                )
+            return self._processes
+    
+    def _generate(self, job: Callable[[], Image.Image],
+                  content_key: Optional[Callable[[], str]]) -> Image.Image:
+        """Lê a miniatura do cache em disco ou a gera (e armazena)"""
+        cache_key = None
+        if self.disk_cache is not None and content_key is not None:
+            cache_key = self.disk_cache.key('thumbnail', content_key(), *self.size)
+            image = self.disk_cache.get_image(cache_key)
+            if image is not None:
+                return image
+        
+        image = job()
+        if cache_key is not None:
+            self.disk_cache.put_image(cache_key, image)
+        return image
+    
+    def _next_entry(self) -> Optional[list]:
+        with self._lock:
+            while self._heap:
+                entry = heapq.heappop(self._heap)
+                if entry[3] is not None:
+                    del self._pending[entry[2]]
+                    self._running += 1
+                    return entry
+            return None
+    
+    def _work(self):
+        """Executado no pool: processa o pedido mais prioritário"""
+        entry = self._next_entry()
+        if entry is None:
+            return
+        _, _, key, job, generation, content_key = entry
+        try:
+            image, error = self._generate(job, content_key), None
+        except Exception as e:
+            image, error = None, e
+        self._results.put((generation, key, image, error))
+        with self._lock:
+            self._running -= 1